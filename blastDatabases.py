@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+#Version: 1.4
+#Authors: Allio Remi & Schomaker-Bastos Alex
+#ISEM - CNRS - LAMPADA - IBQM - UFRJ
+
+'''
+Copyright (c) 2019 Remi Allio - ISEM/CNRS & Alex Schomaker-Bastos - LAMPADA/UFRJ
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+'''
+
+
+import fcntl, hashlib, json, os, shlex, shutil, tempfile
+import runReport
+
+#set by startRegistry, inherited by the processes forked for the annotation
+_registry = None
+
+def startRegistry(folder):
+	'''
+	BLAST databases asked with blastDatabase are kept in folder from now on, and
+	built once for each content.
+	'''
+	global _registry
+	if not os.path.exists(folder):
+		os.makedirs(folder, exist_ok=True)
+	_registry = folder
+
+def blastDatabase(fastaFile, dbtype, blastFolder):
+	'''
+	Returns the name of a BLAST database (dbtype "prot" or "nucl") of the sequences
+	of fastaFile. Without registry the database is built next to fastaFile;
+	otherwise a database with the same sequences is reused if one was already built.
+	'''
+	if _registry == None:
+		command = blastFolder + "/makeblastdb -in " + fastaFile + " -dbtype " + dbtype
+		runReport.run(shlex.split(command), stdout=open(os.devnull, 'wb'))
+		return fastaFile
+	key = hashlib.sha256(dbtype.encode())
+	with open(fastaFile, 'rb') as fasta:
+		for block in iter(lambda: fasta.read(1 << 20), b''):
+			key.update(block)
+	entry = os.path.join(_registry, key.hexdigest()[:24])
+	database = os.path.join(entry, "db.fasta")
+	if os.path.isdir(entry):
+		return database
+	with open(entry + ".lock", 'w') as lock:
+		fcntl.flock(lock, fcntl.LOCK_EX) #contigs annotated at the same time wait for the one building it
+		if not os.path.isdir(entry):
+			tmpEntry = tempfile.mkdtemp(dir=_registry)
+			shutil.copy(fastaFile, os.path.join(tmpEntry, "db.fasta"))
+			command = blastFolder + "/makeblastdb -in " + os.path.join(tmpEntry, "db.fasta") + " -dbtype " + dbtype
+			runReport.run(shlex.split(command), stdout=open(os.devnull, 'wb'))
+			os.rename(tmpEntry, entry)
+	return database
+
+def _readFasta(fastaFile):
+	name, seq = None, []
+	for line in open(fastaFile):
+		line = line.rstrip()
+		if line.startswith(">"):
+			if name: yield (name, ''.join(seq))
+			name, seq = line, []
+		else:
+			seq.append(line)
+	if name: yield (name, ''.join(seq))
+
+def _buildSelection(genesFolder, folder, blastFolder):
+	genes = []
+	databases = []
+	for dbtype, program in (("prot", "blastx"), ("nucl", "blastn")):
+		database = "selection_"+dbtype+"_database.fasta"
+		count = 0
+		smallestGene = 0
+		with open(os.path.join(folder, database), 'w') as out:
+			for line in open(os.path.join(genesFolder, "genes_list")):
+				gene=line.rstrip()
+				if (gene == "rrnL" or gene == "rrnS") != (dbtype == "nucl"):
+					continue
+				genes.append(gene)
+				size = 0
+				for name, seq in _readFasta(os.path.join(genesFolder, "ref_"+gene+"_database.fasta")):
+					out.write(name+"\n"+seq+"\n")
+					count += 1
+					size += len(seq)
+				if size > 0 and (smallestGene == 0 or size < smallestGene):
+					smallestGene = size
+		if count > 0:
+			command = blastFolder + "/makeblastdb -in " + os.path.join(folder, database) + " -dbtype " + dbtype
+			runReport.run(shlex.split(command), stdout=open(os.devnull, 'wb'))
+			databases.append((database, program, count, smallestGene))
+	with open(os.path.join(folder, "selection.json"), 'w') as index:
+		json.dump({"genes": genes, "databases": databases}, index, indent=1)
+
+def selectionDatabases(genesFolder, folder, blastFolder):
+	'''
+	Opens the databases searched to pick the best reference of each gene when there
+	is more than one reference: one protein and one rRNA database gathering the
+	reference genes of genes_list (ref_<gene>_database.fasta files of genesFolder).
+	They are built in folder unless they already are there, folder being kept with
+	the cached reference or the library, so that they are built once per reference.
+	Returns the genes, the reference sequences by name, the databases with the
+	number of sequences they hold and the size of their smallest gene, and the size
+	of each gene. Searched with the size of the smallest gene, the hits of a gene are
+	rescaled to its own size to get the e-values of a search on its own database.
+	'''
+	if not os.path.isfile(os.path.join(folder, "selection.json")):
+		parent = os.path.dirname(os.path.abspath(folder))
+		if not os.path.exists(parent):
+			os.makedirs(parent, exist_ok=True)
+		tmpFolder = tempfile.mkdtemp(dir=parent)
+		try:
+			_buildSelection(genesFolder, tmpFolder, blastFolder)
+			os.rename(tmpFolder, folder)
+		except OSError:
+			if not os.path.isfile(os.path.join(folder, "selection.json")):
+				raise
+		finally:
+			if os.path.exists(tmpFolder): #another run stored them in the meantime
+				shutil.rmtree(tmpFolder)
+	index = json.load(open(os.path.join(folder, "selection.json")))
+	sequences = {}
+	databases = []
+	geneSizes = {}
+	for database, program, count, smallestGene in index["databases"]:
+		for name, seq in _readFasta(os.path.join(folder, database)):
+			sequences.setdefault(name.replace(">",""), []).append(seq)
+			gene = name.split("@")[1]
+			geneSizes[gene] = geneSizes.get(gene, 0) + len(seq)
+		databases.append((os.path.join(folder, database), program, count, smallestGene))
+	return index["genes"], sequences, databases, geneSizes
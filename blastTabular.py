@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+#Version: 1.4
+#Authors: Allio Remi & Schomaker-Bastos Alex
+#ISEM - CNRS - LAMPADA - IBQM - UFRJ
+
+'''
+Copyright (c) 2019 Remi Allio - ISEM/CNRS & Alex Schomaker-Bastos - LAMPADA/UFRJ
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+'''
+
+
+#columns asked to blast with -outfmt, stitle has to stay last as it may contain spaces
+outputFormat = "6 qseqid sseqid nident length qstart qend sstart send qframe sframe evalue bitscore stitle"
+
+class HSP(object):
+	'''
+	One hit segment pair of a tabular blast line, with the attributes geneCheck reads from
+	Bio.SearchIO: ranges are 0-based and start is always the smallest coordinate.
+	'''
+	def __init__(self, ident_num, aln_span, query_range, hit_range, query_frame, hit_frame, evalue, bitscore):
+		self.ident_num = ident_num
+		self.aln_span = aln_span
+		self.query_range = query_range
+		self.hit_range = hit_range
+		self.query_frame = query_frame
+		self.hit_frame = hit_frame
+		self.evalue = evalue
+		self.bitscore = bitscore
+
+class Hit(object):
+	def __init__(self, hitId):
+		self.id = hitId
+		self.hsps = []
+
+class QueryResult(object):
+	def __init__(self, queryId):
+		self.id = queryId
+		self.hits = []
+
+def _blastId(seqId, title):
+	'''Databases made without -parse_seqids give BLAST's own ids, the sequence name is the first word of the title'''
+	if seqId.startswith('gnl|BL_ORD_ID|'):
+		return title.split(' ', 1)[0]
+	return seqId
+
+def parse(blastFile, program):
+	'''
+	Yields a QueryResult for each query of blastFile, written by blast with -outfmt outputFormat.
+	Hits and their hsps keep blast's order, as in the XML output. blastn only reports strands,
+	so its frames are 1 or -1 from the coordinates, as they are in the XML output.
+	'''
+	qresult = None
+	with open(blastFile) as blastLines:
+		for line in blastLines:
+			if line.startswith('#') or not line.strip():
+				continue
+			columns = line.rstrip('\n').split('\t')
+			queryId = columns[0]
+			hitId = _blastId(columns[1], columns[12] if len(columns) > 12 else '')
+			queryStart, queryEnd, hitStart, hitEnd = [int(c) for c in columns[4:8]]
+			if program == 'blastn':
+				queryFrame = 1 if queryStart <= queryEnd else -1
+				hitFrame = 1 if hitStart <= hitEnd else -1
+			else:
+				queryFrame = int(columns[8])
+				hitFrame = int(columns[9])
+			hsp = HSP(int(columns[2]), int(columns[3]),
+				(min(queryStart, queryEnd) - 1, max(queryStart, queryEnd)),
+				(min(hitStart, hitEnd) - 1, max(hitStart, hitEnd)),
+				queryFrame, hitFrame, float(columns[10]), float(columns[11]))
+			if qresult is None or qresult.id != queryId:
+				if qresult is not None:
+					yield qresult
+				qresult = QueryResult(queryId)
+				hits = {}
+			if hitId not in hits:
+				hits[hitId] = Hit(hitId)
+				qresult.hits.append(hits[hitId])
+			hits[hitId].hsps.append(hsp)
+	if qresult is not None:
+		yield qresult
@@ -25,80 +25,111 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 '''
 
-from Bio import SeqIO, SearchIO
-from Bio.Alphabet import generic_dna, generic_protein
-from subprocess import Popen
-import shlex, sys, os
+from Bio import SeqIO
+from Bio.Alphabet import generic_dna
+import sys, os
 
-def circularizationCheck(resultFile, circularSize, circularOffSet, blastFolder):
+#blastn (-task blastn) ungapped scores, used to verify the overlap found from a k-mer seed
+matchScore = 2
+mismatchScore = -3
+xDrop = 20
+#k-mers found more often than this in a contig (homopolymers, microsatellites) are not used as seeds
+maxKmerCount = 8
+#an overlap with fewer distinct trinucleotides is low complexity and not taken as a circularization
+minTrinucleotides = 10
+
+def lowComplexity(sequence):
 	'''
-	Check, with blast, if there is a match between the start and the end of a sequence.
-	Returns a tuple with (True, start, end) or False, accordingly.
+	True if sequence is made of a few repeated bases (e.g. a poly-A or an (AT)n run).
 	'''
-	refSeq = SeqIO.read(resultFile, "fasta", generic_dna)
-	sizeOfSeq = len(refSeq)
+	return len(set(sequence[i:i + 3] for i in range(len(sequence) - 2))) < minTrinucleotides
 
-	try:
-		if blastFolder == 'installed':
-			command = "formatdb -in " + resultFile + " -p F" #need to formatdb refseq first
+def _extend(sequence, queryStart, hitStart, kmerSize):
+	'''
+	Extends the exact seed sequence[queryStart:queryStart+kmerSize] == sequence[hitStart:hitStart+kmerSize]
+	on both sides without gaps, stopping when the score drops xDrop under the best one.
+	Returns the (queryStart, hitStart, length) of the best scoring alignment.
+	'''
+	sizeOfSeq = len(sequence)
+	best = score = 0
+	right = 0
+	i = 0
+	while hitStart + kmerSize + i < sizeOfSeq and score > best - xDrop:
+		if sequence[queryStart + kmerSize + i] == sequence[hitStart + kmerSize + i] != 'N':
+			score += matchScore
 		else:
-			command = blastFolder + "makeblastdb -in " + resultFile + " -dbtype nucl" #need to formatdb refseq first
-		args = shlex.split(command)
-		formatDB = Popen(args, stdout=open(os.devnull, 'wb'))
-		formatDB.wait()
-	except:
-		print('')
-		print("formatDB during circularization check failed...")
-		print('')
-		return (False,-1,-1)
-		
-	with open("circularization_check.blast.xml",'w') as blastResultFile:
-		if blastFolder == 'installed':
-			command = "blastall -p blastn -d " + resultFile + " -i " + resultFile + " -m 7" #call BLAST with XML output
+			score += mismatchScore
+		i += 1
+		if score > best:
+			best, right = score, i
+	best = score = 0
+	left = 0
+	i = 0
+	while queryStart - i > 0 and score > best - xDrop:
+		if sequence[queryStart - i - 1] == sequence[hitStart - i - 1] != 'N':
+			score += matchScore
 		else:
-			command = blastFolder + "blastn -task blastn -db " + resultFile + " -query " + resultFile + " -outfmt 5" #call BLAST with XML output
-		args = shlex.split(command)
-		blastAll = Popen(args, stdout=blastResultFile)
-		blastAll.wait()
-
-	blastparse = SearchIO.parse('circularization_check.blast.xml', 'blast-xml') #get all queries
+			score += mismatchScore
+		i += 1
+		if score > best:
+			best, left = score, i
+	return (queryStart - left, hitStart - left, left + kmerSize + right)
 
+def sequenceCircularization(sequence, circularSize, circularOffSet, kmerSize = 11):
 	'''
-	Let's loop through all blast results and see if there is a circularization.
-	Do it by looking at all HSPs in the parse and see if there is an alignment of the ending of the sequence 
-    with the start of that same sequence. It should have a considerable size, you don't want to say it circularized
-	if only a couple of bases matched.
-	Returns True or False, x_coordinate, y_coordinate
-	x coordinate = starting point of circularization match
-	y coordinate = ending point of circularization match
+	Looks for the start of sequence repeated at its end without running blast: the k-mers
+	starting in the first circularOffSet bases are indexed, the sequence is scanned for them
+	and each seed is extended to verify the overlap. The k-mers found more than maxKmerCount
+	times are not used as seeds. The overlap is accepted with the rules the blast check used:
+	it starts within circularOffSet of the start, ends within circularOffSet of the end, is at
+	least circularSize long and shorter than 90% of the sequence; and it must not be low
+	complexity.
+	Returns a tuple with (True, start, end) of the starting copy, 0-based, or (False, -1, -1).
 	'''
-	for qresult in blastparse: #in each query...
-		for hsp in qresult.hsps: #loop through all HSPs looking for a circularization (perceived as a hsp with start somewhat close to the query finish)
-			if (hsp.query_range[0] >= 0 and hsp.query_range[0] <= circularOffSet) and (hsp.hit_range[0] >= sizeOfSeq - hsp.aln_span - circularOffSet and hsp.hit_range[0] <= sizeOfSeq + circularOffSet) and hsp.aln_span >= circularSize and hsp.aln_span < sizeOfSeq * 0.90:
-				if hsp.hit_range[0] < hsp.query_range[0]:
-					return (True,hsp.hit_range[0],hsp.hit_range[1]) #it seems to have circularized, return True
-				else:
-					return (True,hsp.query_range[0],hsp.query_range[1])
+	sequence = str(sequence).upper()
+	sizeOfSeq = len(sequence)
+	kmerSize = min(kmerSize, circularSize)
+	if kmerSize <= 0 or sizeOfSeq < 2 * kmerSize:
+		return (False,-1,-1)
+	startKmers = {}
+	for i in range(0, min(circularOffSet, sizeOfSeq - kmerSize) + 1):
+		kmer = sequence[i:i + kmerSize]
+		if 'N' not in kmer:
+			startKmers.setdefault(kmer, []).append(i)
+	hits = {} #k-mer -> its positions in the sequence
+	for hitStart in range(1, sizeOfSeq - kmerSize + 1):
+		kmer = sequence[hitStart:hitStart + kmerSize]
+		if kmer in startKmers:
+			positions = hits.setdefault(kmer, [])
+			if len(positions) <= maxKmerCount:
+				positions.append(hitStart)
+	seeds = sorted((hitStart, kmer) for kmer, positions in list(hits.items()) if len(positions) <= maxKmerCount for hitStart in positions)
+	extended = {} #diagonal -> end of the last extension on it, seeds inside are not extended again
+	for hitStart, kmer in seeds:
+		for queryStart in startKmers[kmer]:
+			diagonal = hitStart - queryStart
+			if diagonal <= 0 or extended.get(diagonal, -1) > hitStart:
+				continue
+			alignStart, alignHitStart, alignLen = _extend(sequence, queryStart, hitStart, kmerSize)
+			extended[diagonal] = alignHitStart + alignLen
+			if alignStart <= circularOffSet and alignHitStart + alignLen >= sizeOfSeq - circularOffSet and alignLen >= circularSize and alignLen < sizeOfSeq * 0.90 and not lowComplexity(sequence[alignStart:alignStart + alignLen]):
+				return (True,alignStart,alignStart + alignLen) #it seems to have circularized, return True
 
-	#no circularization was observed in the for loop, so we exited it, just return false
+	#no circularization was observed, just return false
 	return (False,-1,-1)
 
+def circularizationCheck(resultFile, circularSize, circularOffSet, blastFolder = None):
+	'''
+	Check if there is a match between the start and the end of a sequence.
+	Returns a tuple with (True, start, end) or False, accordingly.
+	blastFolder is only kept for the older callers, the check no longer runs blast.
+	'''
+	with open(resultFile) as handle:
+		refSeq = SeqIO.read(handle, "fasta", generic_dna)
+	return sequenceCircularization(refSeq.seq, circularSize, circularOffSet)
+
 if __name__ == '__main__':
 	if sys.argv[1] == '-h' or sys.argv[1] == '--help':
-		print('Usage: fasta_file')
+		print('Usage: fasta_file circular_size circular_offset')
 	else:
-		module_dir = os.path.dirname(__file__)
-		module_dir = os.path.abspath(module_dir)
-		cfg_full_path = os.path.join(module_dir, 'Mitofinder.config')
-
-		with open(cfg_full_path,'r') as configFile:
-			for line in configFile:
-				if '#' != line[0] and line != '\n':
-					configPart = line.lower().replace('\n','').replace(' ','').split('=')[0]
-					if configPart == 'blastfolder':
-						blastFolder = line.replace('\n','').replace(' ','').split('=')[-1]
-
-		if blastFolder.lower() == 'default':
-			blastFolder = os.path.join(module_dir, 'blast/bin/')
-
-		print((circularizationCheck(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), blastFolder)))
+		print((circularizationCheck(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]))))
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+#Version: 1.4
+#Authors: Allio Remi & Schomaker-Bastos Alex
+#ISEM - CNRS - LAMPADA - IBQM - UFRJ
+
+'''
+Copyright (c) 2019 Remi Allio - ISEM/CNRS & Alex Schomaker-Bastos - LAMPADA/UFRJ
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+'''
+
+
+import collections, gzip, re
+
+lineWidth = 60
+
+def filterFasta(fastaFile, outputFile, minSize = 0):
+	'''
+	Streams the (possibly gzip or bgzip compressed) fasta file fastaFile and writes
+	the sequences at least minSize long to outputFile, wrapped at 60 bases, with a
+	samtools-style index (outputFile.fai). Returns the size of each sequence kept
+	and the total size of the sequences of fastaFile, kept or not. The file is read
+	and written as bytes, the offsets of the index being byte offsets.
+	'''
+	with open(fastaFile, 'rb') as f:
+		compressed = f.read(2) == b'\x1f\x8b'
+	if compressed:
+		fasta = gzip.open(fastaFile, 'rb')
+	else:
+		fasta = open(fastaFile, 'rb')
+	out = open(outputFile, 'wb')
+	index = open(outputFile + ".fai", 'w')
+	sizes = collections.OrderedDict()
+	offset = [0]
+	total = [0]
+	def keep(header, lines):
+		if header == None:
+			return
+		seq = b''.join(line.strip() for line in lines)
+		total[0] += len(seq)
+		if len(seq) < minSize:
+			return
+		name = header[1:].split()[0].decode(errors="replace")
+		header = header.rstrip() + b"\n"
+		sizes[name] = len(seq)
+		out.write(header)
+		index.write("%s\t%d\t%d\t%d\t%d\n" %(name, len(seq), offset[0] + len(header), lineWidth, lineWidth + 1))
+		offset[0] += len(header)
+		for i in range(0, len(seq), lineWidth):
+			out.write(seq[i:i+lineWidth] + b"\n")
+			offset[0] += len(seq[i:i+lineWidth]) + 1
+	header, lines = None, []
+	for line in fasta:
+		if line.startswith(b">"):
+			keep(header, lines)
+			header, lines = line, []
+		else:
+			lines.append(line)
+	keep(header, lines)
+	fasta.close()
+	out.close()
+	index.close()
+	return sizes, total[0]
+
+def readIndex(fastaFile):
+	'''
+	Returns the index of fastaFile: name -> (length, offset, bases per line, bytes per line).
+	'''
+	index = collections.OrderedDict()
+	for line in open(fastaFile + ".fai"):
+		name, length, offset, lineBases, lineBytes = line.rstrip("\n").split("\t")[:5]
+		index[name] = (int(length), int(offset), int(lineBases), int(lineBytes))
+	return index
+
+def sequenceSizes(fastaFile):
+	'''
+	Returns the size of each sequence of an indexed fasta file.
+	'''
+	return collections.OrderedDict((name, entry[0]) for name, entry in list(readIndex(fastaFile).items()))
+
+#k-mer coverage written by the assemblers in the headers: MEGAHIT (multi=12.5) and (meta)SPAdes (NODE_1_length_1500_cov_12.5)
+_depthPatterns = [re.compile(r"\smulti=([0-9.]+)"), re.compile(r"_cov_([0-9.]+)")]
+
+def headerDepth(header):
+	'''
+	Returns the depth the assembler wrote in the fasta header, or None.
+	'''
+	for pattern in _depthPatterns:
+		depth = pattern.search(header)
+		if depth != None:
+			try:
+				return float(depth.group(1))
+			except ValueError:
+				return None
+	return None
+
+def _header(fasta, offset):
+	#the header line ends just before the first base, it is read back block by block until its start
+	header = b""
+	end = offset
+	while end > 0:
+		start = max(0, end - 65536)
+		fasta.seek(start)
+		header = fasta.read(end - start) + header
+		headerStart = header.rfind(b"\n>", 0, len(header) - 1)
+		if headerStart != -1:
+			fasta.seek(offset)
+			return header[headerStart + 1:]
+		end = start
+	fasta.seek(offset)
+	return header
+
+def sequenceDepths(fastaFile, names, index = None):
+	'''
+	Returns the depth found in the header of each sequence of names in the indexed
+	fasta file fastaFile (None when the assembler did not write it), reading only
+	these headers.
+	'''
+	if index == None:
+		index = readIndex(fastaFile)
+	depths = {}
+	with open(fastaFile, 'rb') as fasta:
+		for name in names:
+			if name in index:
+				depths[name] = headerDepth(_header(fasta, index[name][1]).decode(errors="replace"))
+	return depths
+
+def extractSequences(fastaFile, names, outputFile, index = None):
+	'''
+	Copies the records of names from the indexed fasta file fastaFile to
+	outputFile, in the order of fastaFile, by seeking to them. index is the
+	one of fastaFile if it was already read.
+	'''
+	if index == None:
+		index = readIndex(fastaFile)
+	with open(fastaFile, 'rb') as fasta, open(outputFile, 'wb') as out:
+		for name in sorted([n for n in names if n in index], key=lambda n: index[n][1]):
+			length, offset, lineBases, lineBytes = index[name]
+			lines = (length + lineBases - 1) // lineBases
+			out.write(_header(fasta, offset))
+			out.write(fasta.read(length + lines * (lineBytes - lineBases)))
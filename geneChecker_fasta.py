@@ -25,12 +25,14 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 '''
 
-from Bio import SeqIO, SearchIO, SeqFeature
+from Bio import SeqIO, SeqFeature
 from Bio.Alphabet import generic_dna, generic_protein
 from subprocess import Popen
+import runReport, blastDatabases, blastTabular
 import genbankOutput, tRNAscanChecker
 from tRNAscanChecker import tRNAconvert, prettyRNAName
 import shlex, sys, os, shutil
+import concurrent.futures
 
 class Alignment():
 	'''
@@ -70,14 +72,42 @@ def read_fasta(fp):
 	if name: yield (name, ''.join(seq))
 
 
-def geneCheck(fastaReference, resultFile, cutoffEquality_prot, cutoffEquality_nucl, usedOwnGenBankReference, blastFolder, organismType = 2, alignCutOff = 45):
+def geneCheck(fastaReference, resultFile, cutoffEquality_prot, cutoffEquality_nucl, usedOwnGenBankReference, blastFolder, organismType = 2, alignCutOff = 45, blasteVal = 0.00001, out_blast = None, executor = None, blastThreads = (2, 2)):
 	'''
 	Returns a tuple with 2 dictionaries, one with the features found and another with features to look for.
+	fastaReference is either a fasta file or a list of (name, seq) tuples already in memory.
+	When executor is given, the protein-coding genes and rRNAs searches run in it at the same time.
+	blastThreads are the -num_threads of blastx and blastn.
 	'''
+	if out_blast == None:
+		out_blast = resultFile.split(".fasta")[0]
+	if isinstance(fastaReference, str):
+		fastaReference = list(read_fasta(open(fastaReference)))
 #	record = SeqIO.read(genBankReference, "genbank", generic_dna)
 	refSeq = SeqIO.read(resultFile, "fasta", generic_dna)
-	listOfImportantFeatures = {}
 	print('Checking protein-coding genes, tRNAs and rRNAs from reference with organismType=%s...' % organismType)
+	proteinArgs = (fastaReference, refSeq, resultFile, cutoffEquality_prot, usedOwnGenBankReference, blastFolder, organismType, alignCutOff, blasteVal, out_blast)
+	rRNAArgs = (fastaReference, refSeq, resultFile, cutoffEquality_prot, cutoffEquality_nucl, usedOwnGenBankReference, blastFolder, organismType, alignCutOff, out_blast)
+	if executor == None:
+		proteins = proteinCheck(*proteinArgs, threads = blastThreads[0])
+		rRNAs = rRNACheck(*rRNAArgs, threads = blastThreads[1])
+	else:
+		proteinSearch = executor.submit(proteinCheck, *proteinArgs, threads = blastThreads[0])
+		rRNASearch = executor.submit(rRNACheck, *rRNAArgs, threads = blastThreads[1])
+		proteins = proteinSearch.result()
+		rRNAs = rRNASearch.result()
+	listOfPresentFeatures, listOfImportantFeatures, listOfSplits, listOfCompleteGenes = proteins
+	listOfPresentFeatures.update(rRNAs[0])
+	listOfImportantFeatures.update(rRNAs[1])
+	listOfSplits += [featureName for featureName in rRNAs[2] if featureName not in listOfSplits]
+	return (listOfPresentFeatures, listOfImportantFeatures, listOfSplits, listOfCompleteGenes)
+
+def proteinCheck(fastaReference, refSeq, resultFile, cutoffEquality_prot, usedOwnGenBankReference, blastFolder, organismType, alignCutOff, blasteVal, out_blast, threads = 2):
+	'''
+	Looks for the protein-coding genes of fastaReference in refSeq (read from resultFile) with blastx.
+	Returns the features found, the features looked for, the split genes and the complete genes.
+	'''
+	listOfImportantFeatures = {}
 	listOfPresentFeatures = {}
 	listOfSplits = []
 	listOfCompleteGenes = []
@@ -85,10 +115,10 @@ def geneCheck(fastaReference, resultFile, cutoffEquality_prot, cutoffEquality_nu
 	Do protein-coding genes first!
 	'''
 	#let's create the fasta file and the list of features we are looking for
-	refGenes=open(fastaReference)
-	importantFeaturesFile=open('important_features.fasta', 'w')
+	refGenes=fastaReference
+	importantFeaturesFile=open('important_features.cds.fasta', 'w')
 	nbrgene=0
-	for name, seq in read_fasta(refGenes):
+	for name, seq in refGenes:
 		if name.split("@")[1] != "rrnL" and name.split("@")[1] != "rrnS" :
 			nbrgene+=1
 			featureName=name.split("@")[1]
@@ -119,26 +149,21 @@ def geneCheck(fastaReference, resultFile, cutoffEquality_prot, cutoffEquality_nu
 	if nbrgene > 0:
 		
 		print("Formatting database for blast...")
-		command = blastFolder + "/makeblastdb -in important_features.fasta -dbtype prot" #need to formatdb refseq first
-	
-		args = shlex.split(command)
-		formatDB = Popen(args, stdout=open(os.devnull, 'wb'))
-		formatDB.wait()
+		database = blastDatabases.blastDatabase("important_features.cds.fasta", "prot", blastFolder)
 		
 		#print "Running blast against refSeq to determine if a hit was built..."
-		with open("important_features.blast.xml",'w') as blastResultFile:
+		with open("important_features.cds.blast.tsv",'w') as blastResultFile:
 			if usedOwnGenBankReference == True: #using a personal genbank reference
-				command = blastFolder+"/blastx -db important_features.fasta -query " + resultFile + " -evalue " + str(blasteVal) + " -outfmt 5 -num_threads 2 -query_gencode " + str(organismType) + " -seg no" #call BLAST with XML output
+				command = blastFolder+"/blastx -db " + database + " -query " + resultFile + " -evalue " + str(blasteVal) + " -outfmt '" + blastTabular.outputFormat + "' -num_threads " + str(threads) + " -query_gencode " + str(organismType) + " -seg no" #call BLAST with tabular output
 			else: #using a non personal genbank reference
 				print(('Genetic code: ', str(organismType)))
-				command = blastFolder+"/blastx -db important_features.fasta -query " + resultFile + "-evalue " + str(blasteVal) + " -outfmt 5 -num_threads 2 -query_gencode " + str(organismType) + " -seg no" #call BLAST with XML output
+				command = blastFolder+"/blastx -db " + database + " -query " + resultFile + "-evalue " + str(blasteVal) + " -outfmt '" + blastTabular.outputFormat + "' -num_threads " + str(threads) + " -query_gencode " + str(organismType) + " -seg no" #call BLAST with tabular output
 			args = shlex.split(command)
-			blastAll = Popen(args, stdout=blastResultFile)
-			blastAll.wait()
-		#SearchIO object handler and checker for best hit separation
+			blastAll = runReport.run(args, stdout=blastResultFile)
+		#tabular hits handler and checker for best hit separation
 		listOfSplits = []
 		listOfCompleteGenes = []
-		blastparse = SearchIO.parse('important_features.blast.xml', 'blast-xml') #get all queries
+		blastparse = blastTabular.parse('important_features.cds.blast.tsv', 'blastx') #get all queries
 		listOfPresentFeatures = {}
 		for qresult in blastparse: #in each query, let's look for a good hit
 			for qhit in qresult.hits:
@@ -169,16 +194,26 @@ def geneCheck(fastaReference, resultFile, cutoffEquality_prot, cutoffEquality_nu
 
 		#exit()
 		#copying the blast result in order for this info to be assessed later if the user desires
-		shutil.copyfile("important_features.blast.xml", out_blast+"_ref.cds.blast.xml")
-		os.remove("important_features.blast.xml")
-		shutil.copyfile("important_features.fasta", out_blast+"_ref.cds.fasta")
-	os.remove("important_features.fasta")
+		shutil.copyfile("important_features.cds.blast.tsv", out_blast+"_ref.cds.blast.tsv")
+		os.remove("important_features.cds.blast.tsv")
+		shutil.copyfile("important_features.cds.fasta", out_blast+"_ref.cds.fasta")
+	os.remove("important_features.cds.fasta")
 	
+	return (listOfPresentFeatures, listOfImportantFeatures, listOfSplits, listOfCompleteGenes)
+
+def rRNACheck(fastaReference, refSeq, resultFile, cutoffEquality_prot, cutoffEquality_nucl, usedOwnGenBankReference, blastFolder, organismType, alignCutOff, out_blast, threads = 2):
+	'''
+	Looks for the rRNAs of fastaReference in refSeq (read from resultFile) with blastn.
+	Returns the features found, the features looked for and the split rRNAs.
+	'''
+	listOfImportantFeatures = {}
+	listOfPresentFeatures = {}
+	listOfSplits = []
 	#let's create the fasta file and the list of features we are looking for
-	refGenes=open(fastaReference)
-	importantFeaturesFile=open('important_features.fasta', 'w')
+	refGenes=fastaReference
+	importantFeaturesFile=open('important_features.rRNA.fasta', 'w')
 	nbrRNA=0
-	for name, seq in read_fasta(refGenes):
+	for name, seq in refGenes:
 		if name.split("@")[1] == "rrnL" or name.split("@")[1] == "rrnS" :
 			nbrRNA+=1
 			featureName=name.split("@")[1]
@@ -208,31 +243,26 @@ def geneCheck(fastaReference, resultFile, cutoffEquality_prot, cutoffEquality_nu
 	#running blast
 	if nbrRNA > 0:
 		print("Formatting database for blast...")
-		command = blastFolder+"/makeblastdb -in important_features.fasta -dbtype nucl" #need to formatdb refseq first
-	
-		args = shlex.split(command)
-		formatDB = Popen(args, stdout=open(os.devnull, 'wb'))
-		formatDB.wait()
+		database = blastDatabases.blastDatabase("important_features.rRNA.fasta", "nucl", blastFolder)
 	
-		with open("important_features.blast.xml",'w') as blastResultFile:
+		with open("important_features.rRNA.blast.tsv",'w') as blastResultFile:
 			if usedOwnGenBankReference == True: #using a personal genbank reference, make e-value more restrict
-				command = blastFolder+"/blastn -db important_features.fasta -query " + resultFile + " -outfmt 5 -num_threads 2 -word_size 8 -perc_identity " + str(cutoffEquality_nucl) + " -max_hsps 5 -gapextend 2 -gapopen 2 "+ "-dust no" #call BLAST with XML output
+				command = blastFolder+"/blastn -db " + database + " -query " + resultFile + " -outfmt '" + blastTabular.outputFormat + "' -num_threads " + str(threads) + " -word_size 8 -perc_identity " + str(cutoffEquality_nucl) + " -max_hsps 5 -gapextend 2 -gapopen 2 "+ "-dust no" #call BLAST with tabular output
 			else: #using a non personal genbank reference
-				command = blastFolder+"/blastn -db important_features.fasta -query " + resultFile + " -outfmt 5 -num_threads 2 -word_size 8 -perc_identity " + str(cutoffEquality_nucl) + " -max_hsps 5 -gapextend 2 -gapopen 2 " + "-dust no" #call BLAST with XML output
+				command = blastFolder+"/blastn -db " + database + " -query " + resultFile + " -outfmt '" + blastTabular.outputFormat + "' -num_threads " + str(threads) + " -word_size 8 -perc_identity " + str(cutoffEquality_nucl) + " -max_hsps 5 -gapextend 2 -gapopen 2 " + "-dust no" #call BLAST with tabular output
 			args = shlex.split(command)
-			blastAll = Popen(args, stdout=blastResultFile)
-			blastAll.wait()
+			blastAll = runReport.run(args, stdout=blastResultFile)
 		"""with open("important_features.blast2.out",'w') as blastResultFile:
 			if usedOwnGenBankReference == True: #using a personal genbank reference, make e-value more restrict
-				command = blastFolder+"/blastn -db important_features.fasta -query " + resultFile + " -outfmt 6 -num_threads 2 -word_size 8 -perc_identity " + str(cutoffEquality_nucl) + " -max_hsps 5 -gapextend 2 -gapopen 2 "+ "-dust no" #call BLAST with XML output
+				command = blastFolder+"/blastn -db " + database + " -query " + resultFile + " -outfmt 6 -num_threads 2 -word_size 8 -perc_identity " + str(cutoffEquality_nucl) + " -max_hsps 5 -gapextend 2 -gapopen 2 "+ "-dust no" #call BLAST with XML output
 			else: #using a non personal genbank reference
-				command = blastFolder+"/blastn -db important_features.fasta -query " + resultFile + " -outfmt 6 -num_threads 2 -word_size 8 -perc_identity " + str(cutoffEquality_nucl) + " -max_hsps 5 -gapextend 2 -gapopen 2 " + "-dust no" #call BLAST with XML output
+				command = blastFolder+"/blastn -db " + database + " -query " + resultFile + " -outfmt 6 -num_threads 2 -word_size 8 -perc_identity " + str(cutoffEquality_nucl) + " -max_hsps 5 -gapextend 2 -gapopen 2 " + "-dust no" #call BLAST with XML output
 			args = shlex.split(command)
 			blastAll = Popen(args, stdout=blastResultFile)
 			blastAll.wait()"""
 	
-		#SearchIO object handler and checker for best hit separation
-		blastparse = SearchIO.parse('important_features.blast.xml', 'blast-xml') #get all queries
+		#tabular hits handler and checker for best hit separation
+		blastparse = blastTabular.parse('important_features.rRNA.blast.tsv', 'blastn') #get all queries
 		"""for qresult in blastparse: #in each query, let's look for a good hit
 			for qhit in qresult.hits:
 				for hsp in qhit.hsps: #hsp object checking, this contains the alignment info 
@@ -286,13 +316,13 @@ def geneCheck(fastaReference, resultFile, cutoffEquality_prot, cutoffEquality_nu
 									break
 		
 				
-		shutil.copyfile("important_features.blast.xml", out_blast+"_ref.blast.xml")
-		shutil.copyfile("important_features.fasta", out_blast+"_ref.fasta")
-		os.remove("important_features.blast.xml")
+		shutil.copyfile("important_features.rRNA.blast.tsv", out_blast+"_ref.blast.tsv")
+		shutil.copyfile("important_features.rRNA.fasta", out_blast+"_ref.fasta")
+		os.remove("important_features.rRNA.blast.tsv")
 
-	os.remove("important_features.fasta")
+	os.remove("important_features.rRNA.fasta")
 	
-	return (listOfPresentFeatures, listOfImportantFeatures, listOfSplits, listOfCompleteGenes)
+	return (listOfPresentFeatures, listOfImportantFeatures, listOfSplits)
 
 def createImageOfAnnotation(sequenceObject, outputFile):
 	'''Creates an image of the annotation, with relative positions of features and their size'''
@@ -394,6 +424,122 @@ def createImageOfAnnotation(sequenceObject, outputFile):
 	im.save(outputFile, 'PNG')
 
 
+def annotateContig(fastaReference, resultFile, outputFile, organismType = 2, alignCutOff = 45, coveCutOff = 7, blasteVal = 0.00001,
+					percent_equality_prot = 40, percent_equality_nucl = 50, nWalk = 5, tRNAscan = "mitfi", blastFolder = 'installed', tRNAFolder = None, threads = 1):
+	'''
+	Annotates the contig in resultFile: protein-coding genes and rRNAs with blast against fastaReference,
+	tRNAs with tRNAscan. Writes outputFile (.gb), its image and the _raw.gff used by sort_gff.
+	Returns the annotated SeqRecord, or None if the tRNA annotation failed.
+	The searches use threads threads: with 2, the tRNAs search runs during the blast searches, with 3 or
+	more the protein-coding genes, rRNAs and tRNAs searches run at the same time, blastx and blastn
+	sharing the threads left by the tRNAs search.
+	'''
+	out_blast=resultFile.split(".fasta")[0]
+	executor = None
+	blastExecutor = None
+	blastThreads = (1, 1)
+	if threads > 1:
+		executor = concurrent.futures.ThreadPoolExecutor(3 if threads > 2 else 1)
+		print(('Running tRNA annotation with '+tRNAscan+' during the blast searches'))
+		tRNASearch = executor.submit(tRNAscanChecker.tRNAscanCheck, resultFile, True, False, organismType, coveCutOff, False, False, tRNAscan, tRNAFolder)
+		if threads > 2:
+			blastExecutor = executor
+			blastThreads = (threads - 1 - (threads - 1) // 2, (threads - 1) // 2)
+	try:
+		x = geneCheck(fastaReference, resultFile, percent_equality_prot, percent_equality_nucl, True, blastFolder, organismType, alignCutOff, blasteVal, out_blast, executor = blastExecutor, blastThreads = blastThreads)
+		if executor != None:
+			assemblyCheck = tRNASearch.result()
+	finally:
+		if executor != None:
+			executor.shutdown()
+	print('Features found: %s' % len(x[0]))
+	print('Total features: %s' % len(x[1]))
+	print('')
+	presentFeatures = x[0]
+	if executor == None:
+		print(('Running tRNA annotation with '+tRNAscan))
+		assemblyCheck = tRNAscanChecker.tRNAscanCheck(resultFile, True, False, organismType, coveCutOff, False, False, tRNAscan, tRNAFolder) #returns a Assembly object with statistics and alignment info 
+	if assemblyCheck == False:
+		return None
+	tRNAs = assemblyCheck.tRNAs
+	
+	listOfFeaturesToOutput = []
+	listOfFoundTRNAs = []
+	for foundFeature in presentFeatures:
+		thisFeatureFound = presentFeatures[foundFeature][1]
+		#comparing tRNAscan-SE results with this, in case tRNAscan-SE was run
+		if "trn" in thisFeatureFound.seq2.lower():
+			for tRNAFound in tRNAs:
+			#down here we update the start and end positions of tRNAs found with Needle, with the
+			#results outputted by tRNAScan-SE
+			#tRNAconver = guarantees all tRNA names are in tRNA-Phe format
+				if 'trna-' + tRNAFound.tRNAtype.lower() == tRNAconvert(thisFeatureFound.seq2.lower()):
+					thisFeatureFound.startBase = min(tRNAFound.tRNAcoordinates[0],
+									tRNAFound.tRNAcoordinates[1])
+					thisFeatureFound.endBase = max(tRNAFound.tRNAcoordinates[0],
+									tRNAFound.tRNAcoordinates[1])
+					if tRNAFound.tRNAcoordinates[0] > tRNAFound.tRNAcoordinates[1]:
+						thisFeatureFound.frame = -1
+					else:
+						thisFeatureFound.frame = 1
+
+					break
+
+			listOfFoundTRNAs.append(thisFeatureFound.seq2.lower())
+
+		listOfFeaturesToOutput.append(thisFeatureFound)
+
+	#if tRNAscan-SE was run, check the tRNAs it found and input them in the features to output list
+	for tRNAFound in tRNAs:
+		tRNAName = 'trna-' + tRNAFound.tRNAtype.lower()
+		if tRNAFound.tRNAintronBegin > 0:
+			print('WARNING: %s was found with an intron!' % prettyRNAName(tRNAName))
+		if tRNAName not in tRNAconvert(listOfFoundTRNAs) and 'trna-sec' not in tRNAName and 'trna-sup' not in tRNAName:
+			newTRNAStart = tRNAFound.tRNAcoordinates[0]
+			newTRNAEnd = tRNAFound.tRNAcoordinates[1]
+			newTRNALen = max(newTRNAStart, newTRNAEnd) - min(newTRNAStart, newTRNAEnd)
+			newTRNA = Alignment(tRNAName, prettyRNAName(tRNAName), newTRNALen)
+			newTRNA.startBase = min(newTRNAStart, newTRNAEnd)+1
+			newTRNA.endBase = max(newTRNAStart, newTRNAEnd)
+			thisFeatureFound = newTRNA
+
+			if newTRNAStart > newTRNAEnd:
+				newTRNA.frame = -1
+			else:
+				newTRNA.frame = 1
+	
+			presentFeatures[prettyRNAName(tRNAName)] = (False, thisFeatureFound, False)
+
+			listOfFeaturesToOutput.append(thisFeatureFound)
+
+	listOfFeaturesToOutput.sort()
+	print('Total features found after '+str(tRNAscan)+': ',len(listOfFeaturesToOutput))
+
+	finalResults = genbankOutput.genbankOutput(outputFile, resultFile, listOfFeaturesToOutput, False, 900, nWalk)
+
+	with open(outputFile, "w") as outputResult:
+		count = SeqIO.write(finalResults, outputResult, "genbank")
+		createImageOfAnnotation(finalResults, outputFile.split(".gb")[0]+'.png')
+
+	gffFile=outputFile.split(".gb")[0]+'_raw.gff'
+	gffFile=open(gffFile,"w")
+	seq = SeqIO.read(open(resultFile, 'rU'), "fasta", generic_dna)
+	seq_name = seq.name
+
+	genes={}
+	for gbkFeature in finalResults.features:
+		for qualifier in gbkFeature.qualifiers:
+			if qualifier == 'product' or qualifier == 'gene':
+				if gbkFeature.location.strand == 1:
+					direction="+"
+				if gbkFeature.location.strand == -1:
+					direction="-"
+				if gbkFeature.qualifiers[qualifier] not in genes:
+					gffFile.write(seq_name+"\t"+"mitofinder"+"\t"+str(gbkFeature.type)+"\t"+str(gbkFeature.location.start+1)+"\t"+str(gbkFeature.location.end)+"\t"+"."+"\t"+direction+"\t"+"0"+"\t"+str(gbkFeature.qualifiers[qualifier])+"\n")
+					genes[gbkFeature.qualifiers[qualifier]]=gbkFeature.qualifiers[qualifier]
+	gffFile.close()
+	return finalResults
+
 if __name__ == "__main__":
 	blasteVal=sys.argv[7]
 	percent_equality_prot=sys.argv[8]
@@ -422,7 +568,6 @@ if __name__ == "__main__":
 
 		fastaReference = sys.argv[1]
 		resultFile = sys.argv[2]
-		out_blast=resultFile.split(".fasta")[0]
 		outputFile = sys.argv[3]
 		try:
 			organismType = int(sys.argv[4])
@@ -442,113 +587,5 @@ if __name__ == "__main__":
 		except:
 			coveCutOff = 7
 			print("coveCutOff was not specified, assuming 7")
-		x = geneCheck(fastaReference, resultFile, percent_equality_prot, percent_equality_nucl, True, blastFolder, organismType, alignCutOff)
-		print('Features found: %s' % len(x[0]))
-		print('Total features: %s' % len(x[1]))
-		print('')
-		print(('Running tRNA annotation with '+tRNAscan))
-		presentFeatures = x[0]
-		assemblyCheck = tRNAscanChecker.tRNAscanCheck(resultFile, True, False, organismType, coveCutOff, False, False, tRNAscan) #returns a Assembly object with statistics and alignment info 
-		tRNAs = assemblyCheck.tRNAs
-		
-		listOfFeaturesToOutput = []
-		listOfFoundTRNAs = []
-		for foundFeature in presentFeatures:
-			thisFeatureFound = presentFeatures[foundFeature][1]
-			#comparing tRNAscan-SE results with this, in case tRNAscan-SE was run
-			if "trn" in thisFeatureFound.seq2.lower():
-				for tRNAFound in tRNAs:
-				#down here we update the start and end positions of tRNAs found with Needle, with the
-				#results outputted by tRNAScan-SE
-				#tRNAconver = guarantees all tRNA names are in tRNA-Phe format
-					if 'trna-' + tRNAFound.tRNAtype.lower() == tRNAconvert(thisFeatureFound.seq2.lower()):
-						thisFeatureFound.startBase = min(tRNAFound.tRNAcoordinates[0],
-										tRNAFound.tRNAcoordinates[1])
-						thisFeatureFound.endBase = max(tRNAFound.tRNAcoordinates[0],
-										tRNAFound.tRNAcoordinates[1])
-						if tRNAFound.tRNAcoordinates[0] > tRNAFound.tRNAcoordinates[1]:
-							thisFeatureFound.frame = -1
-						else:
-							thisFeatureFound.frame = 1
-
-						break
-
-				listOfFoundTRNAs.append(thisFeatureFound.seq2.lower())
-
-			listOfFeaturesToOutput.append(thisFeatureFound)
-
-		#if tRNAscan-SE was run, check the tRNAs it found and input them in the features to output list
-		for tRNAFound in tRNAs:
-			tRNAName = 'trna-' + tRNAFound.tRNAtype.lower()
-			if tRNAFound.tRNAintronBegin > 0:
-				print('WARNING: %s was found with an intron!' % prettyRNAName(tRNAName))
-			if tRNAName not in tRNAconvert(listOfFoundTRNAs) and 'trna-sec' not in tRNAName and 'trna-sup' not in tRNAName:
-				newTRNAStart = tRNAFound.tRNAcoordinates[0]
-				newTRNAEnd = tRNAFound.tRNAcoordinates[1]
-				newTRNALen = max(newTRNAStart, newTRNAEnd) - min(newTRNAStart, newTRNAEnd)
-				newTRNA = Alignment(tRNAName, prettyRNAName(tRNAName), newTRNALen)
-				newTRNA.startBase = min(newTRNAStart, newTRNAEnd)+1
-				newTRNA.endBase = max(newTRNAStart, newTRNAEnd)
-				thisFeatureFound = newTRNA
-
-				if newTRNAStart > newTRNAEnd:
-					newTRNA.frame = -1
-				else:
-					newTRNA.frame = 1
-		
-				presentFeatures[prettyRNAName(tRNAName)] = (False, thisFeatureFound, False)
-
-				listOfFeaturesToOutput.append(thisFeatureFound)
-
-		listOfFeaturesToOutput.sort()
-		print('Total features found after '+str(tRNAscan)+': ',len(listOfFeaturesToOutput))
-
-		finalResults = genbankOutput.genbankOutput(outputFile, resultFile, listOfFeaturesToOutput, False, 900, nWalk)
-
-		with open(outputFile, "w") as outputResult:
-			count = SeqIO.write(finalResults, outputResult, "genbank")
-			createImageOfAnnotation(finalResults, outputFile.split(".gb")[0]+'.png')
-
-		outputFile=outputFile.split(".gb")[0]+'_raw.gff'
-		outputFile=open(outputFile,"w")
-		seq = SeqIO.read(open(resultFile, 'rU'), "fasta", generic_dna)
-		seq_name = seq.name
-
-		genes={}
-		for gbkFeature in finalResults.features:
-			for qualifier in gbkFeature.qualifiers:
-				if qualifier == 'product' or qualifier == 'gene':
-					if gbkFeature.location.strand == 1:
-						direction="+"
-					if gbkFeature.location.strand == -1:
-						direction="-"
-					if gbkFeature.qualifiers[qualifier] not in genes:
-						outputFile.write(seq_name+"\t"+"mitofinder"+"\t"+str(gbkFeature.type)+"\t"+str(gbkFeature.location.start+1)+"\t"+str(gbkFeature.location.end)+"\t"+"."+"\t"+direction+"\t"+"0"+"\t"+str(gbkFeature.qualifiers[qualifier])+"\n")
-						genes[gbkFeature.qualifiers[qualifier]]=gbkFeature.qualifiers[qualifier]
-		outputFile.close()
-		"""
-		if ('TRNF' in presentFeatures) or ('tRNA-Phe' in presentFeatures) or ('trnf' in presentFeatures) or ('trnF' in presentFeatures):
-			print 'Creating ordered genbank file (with tRNA-Phe at the start)...'
-			resultOrderedGbFile = outputFile.replace('.gb','') + '.ordered.gb'
-
-			if 'TRNF' in presentFeatures:
-				lookForPhe = 'TRNF'
-			elif 'tRNA-Phe' in presentFeatures:
-				lookForPhe = 'tRNA-Phe'
-			elif 'trnf' in presentFeatures:
-				lookForPhe = 'trnf'
-			elif 'trnF' in presentFeatures:
-				lookForPhe = 'trnF'
-
-			pheAlignment = presentFeatures[lookForPhe][1]
-			pheStart = pheAlignment.startBase
-			orderedFinalResults = finalResults[pheStart:] + finalResults[0:pheStart]
-
-			with open(resultOrderedGbFile, "w") as outputResult: #create the file!
-				count = SeqIO.write(orderedFinalResults, outputResult, "genbank")
-				count = SeqIO.write(orderedFinalResults, resultOrderedGbFile.replace('.gb','.fasta'), "fasta")
-				createImageOfAnnotation(orderedFinalResults, 'orderedResult.png')
-			
-		else:
-			print "Since tRNA-Phe couldn't be found, ordered genbank file wasn't created."
-		"""
+		annotateContig(fastaReference, resultFile, outputFile, organismType, alignCutOff, coveCutOff, blasteVal,
+			percent_equality_prot, percent_equality_nucl, nWalk, tRNAscan, blastFolder)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+#Version: 1.4
+#Authors: Allio Remi & Schomaker-Bastos Alex
+#ISEM - CNRS - LAMPADA - IBQM - UFRJ
+
+'''
+Copyright (c) 2019 Remi Allio - ISEM/CNRS & Alex Schomaker-Bastos - LAMPADA/UFRJ
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+'''
+
+
+from Bio import SeqIO
+from Bio.Alphabet import generic_dna
+
+def _qualifier(feature, key):
+	value = feature.qualifiers[key]
+	if isinstance(value, list): #the qualifiers of a record read from a .gb file are lists
+		value = value[0]
+	return str(value)
+
+def geneFastas(gbFile, processName, merge, record = None):
+	'''
+	Writes the nucleotide and amino acid sequences of the genes of the contig annotated in
+	gbFile to its _genes_NT.fasta and _genes_AA.fasta files. record is the SeqRecord of
+	gbFile if it is still in memory, else gbFile is read. Returns the number of genes written.
+	'''
+	if record == None:
+		with open(gbFile) as infile:
+			record = SeqIO.read(infile, "genbank", generic_dna)
+
+	#one pass over the features, the sequence of each one is extracted once
+	genes = []
+	dgen = {}
+	for feature in record.features:
+		if feature.type.lower() == 'cds' or feature.type == 'rRNA':
+			seq_aa = ""
+			if 'gene' in feature.qualifiers:
+				featureName = _qualifier(feature, 'gene')
+				if 'translation' in feature.qualifiers:
+					seq_aa = _qualifier(feature, 'translation')
+			elif 'product' in feature.qualifiers:
+				featureName = _qualifier(feature, 'product')
+				if 'translation' in feature.qualifiers:
+					seq_aa = _qualifier(feature, 'translation')
+			featureName = ''.join(featureName.split()).split("_")[0]
+			if featureName in dgen:
+				dgen[featureName] += 1
+			else:
+				dgen[featureName] = 1
+			#a record read from a .gb file has an upper case sequence
+			genes.append((featureName, str(feature.extract(record).seq).upper(), seq_aa, feature.location.strand == 1))
+
+	gnb = 0
+	dico_cds_n = {}
+	dico_cds_aa = {}
+	dico_cds_nt = {}
+	out_fasta_nt = open(gbFile.split(".gb")[0]+"_genes_NT.fasta", "w")
+	out_fasta_aa = open(gbFile.split(".gb")[0]+"_genes_AA.fasta", "w")
+	for featureName, seq_nt, seq_aa, forward in genes:
+		if dgen.get(featureName) == 1:
+			gnb = gnb+1
+			out_fasta_nt.write('>' + processName + "@" + featureName + '\n')
+			out_fasta_nt.write(seq_nt + '\n')
+			if seq_aa != "":
+				out_fasta_aa.write('>' + processName + "@" + featureName + '\n')
+				out_fasta_aa.write(seq_aa + '\n')
+
+		elif featureName not in dico_cds_n and merge == True:
+			gnb = gnb+1
+			dico_cds_n[featureName] = 1
+			dico_cds_nt[featureName] = seq_nt
+			if seq_aa != "":
+				dico_cds_aa[featureName] = seq_aa
+		elif featureName in dico_cds_n and dico_cds_n.get(featureName) < dgen.get(featureName) and merge == True:
+			dico_cds_n[featureName] += 1
+			if forward:
+				dico_cds_nt[featureName] = str(dico_cds_nt.get(featureName))+seq_nt
+				if seq_aa != "":
+					dico_cds_aa[featureName] = str(dico_cds_aa.get(featureName))+seq_aa
+			else:
+				dico_cds_nt[featureName] = seq_nt+str(dico_cds_nt.get(featureName))
+				if seq_aa != "":
+					dico_cds_aa[featureName] = seq_aa+str(dico_cds_aa.get(featureName))
+		else:
+			if featureName not in dico_cds_n:
+				dico_cds_n[featureName] = 1
+				gnb = gnb+1
+			out_fasta_nt.write('>' + processName + "@" + featureName + '\n')
+			out_fasta_nt.write(seq_nt + '\n')
+			if seq_aa != "":
+				out_fasta_aa.write('>' + processName + "@" + featureName + '\n')
+				out_fasta_aa.write(seq_aa + '\n')
+
+		if featureName in dico_cds_n and dico_cds_n.get(featureName) == dgen.get(featureName) and merge == True:
+			out_fasta_nt.write('>' + processName + "@" + featureName + '\n')
+			out_fasta_nt.write(str(dico_cds_nt.get(featureName)) + '\n')
+			if str(dico_cds_aa.get(featureName)) != "":
+				out_fasta_aa.write('>' + processName + "@" + featureName + '\n')
+				out_fasta_aa.write(str(dico_cds_aa.get(featureName)) + '\n')
+	out_fasta_nt.close()
+	out_fasta_aa.close()
+	return gnb
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+#Version: 1.4
+#Authors: Allio Remi & Schomaker-Bastos Alex
+#ISEM - CNRS - LAMPADA - IBQM - UFRJ
+
+'''
+Copyright (c) 2019 Remi Allio - ISEM/CNRS & Alex Schomaker-Bastos - LAMPADA/UFRJ
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+'''
+
+
+#standard mitochondrial genes annotated by MitoFinder and the names they are given in GenBank files:
+#the short names are compared in lower case, the spelled out ones (and all the rRNA names) also without spaces nor dashes
+synonyms = {
+	"COX1": ("cox1", "coi", "coxi", "co1", "cytochromecoxidasesubunit1"),
+	"COX2": ("cox2", "coii", "coxii", "co2"),
+	"COX3": ("cox3", "coiii", "coxiii", "co3"),
+	"CYTB": ("cytb", "cob"),
+	"ND1": ("nd1", "nad1", "ndh1", "nadh1"),
+	"ND2": ("nd2", "nad2", "ndh2", "nadh2"),
+	"ND3": ("nd3", "nad3", "ndh3", "nadh3"),
+	"ND4": ("nd4", "nad4", "ndh4", "nadh4"),
+	"ND4L": ("nd4l", "nad4l", "ndh4l", "nadh4l"),
+	"ND5": ("nd5", "nad5", "ndh5", "nadh5"),
+	"ND6": ("nd6", "nad6", "ndh6", "nadh6"),
+	"ATP8": ("atp8",),
+	"ATP6": ("atp6",),
+}
+spelledOutSynonyms = {
+	"COX1": ("cytochromecoxidasesubuniti",),
+	"COX2": ("cytochromecoxidasesubunit2", "cytochromecoxidasesubunitii"),
+	"COX3": ("cytochromecoxidasesubunit3", "cytochromecoxidasesubunitiii"),
+	"CYTB": ("cytochromeb",),
+	"ND1": ("nadhdehydrogenasesubunit1", "nadhdehydrogenasesubuniti"),
+	"ND2": ("nadhdehydrogenasesubunit2", "nadhdehydrogenasesubunitii"),
+	"ND3": ("nadhdehydrogenasesubunit3", "nadhdehydrogenasesubunitiii"),
+	"ND4": ("nadhdehydrogenasesubunit4", "nadhdehydrogenasesubunitiv"),
+	"ND4L": ("nadhdehydrogenasesubunit4l", "nadhdehydrogenasesubunitivl"),
+	"ND5": ("nadhdehydrogenasesubunit5", "nadhdehydrogenasesubunitv"),
+	"ND6": ("nadhdehydrogenasesubunit6", "nadhdehydrogenasesubunitvi"),
+	"ATP8": ("atpsynthasef0subunit8", "atpase8"),
+	"ATP6": ("atpsynthasef0subunit6", "atpase6"),
+	"rrnL": ("rrnl", "16sribosomalrna", "largesubunitribosomalrna", "lrrna", "16srrna", "rnr2", "mtrnr2", "rrn16", "rnl", "lsu"),
+	"rrnS": ("rrns", "12sribosomalrna", "smallsubunitribosomalrna", "srrna", "12srrna", "rnr1", "mtrnr1", "rrn12", "rns", "ssu"),
+}
+rRNAGenes = ("rrnL", "rrnS")
+
+_standardName = {}
+for gene, names in list(synonyms.items()):
+	for name in names:
+		_standardName[name] = gene
+_spelledOutName = {}
+for gene, names in list(spelledOutSynonyms.items()):
+	for name in names:
+		_spelledOutName[name] = gene
+
+def standardGeneName(name):
+	'''
+	Returns the MitoFinder name of a gene named name in a GenBank file, or None
+	if it is not a standard mitochondrial gene.
+	'''
+	name = name.lower()
+	if name in _standardName:
+		return _standardName[name]
+	return _spelledOutName.get(name.replace(" ","").replace("-",""))
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+#Version: 1.4
+#Authors: Allio Remi & Schomaker-Bastos Alex
+#ISEM - CNRS - LAMPADA - IBQM - UFRJ
+
+'''
+Copyright (c) 2019 Remi Allio - ISEM/CNRS & Alex Schomaker-Bastos - LAMPADA/UFRJ
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+'''
+
+
+import collections, itertools, multiprocessing
+import readStreams, circularizationCheck
+
+chunkSize = 5000 #pairs sent to a worker at a time
+minRecruitedCount = 2 #k-mers of the recruited reads added to the index must be in at least this many of them
+
+#index of the current round, inherited by the forked workers
+_index = None
+_k = None
+
+_complement = bytes.maketrans(b'ACGT', b'TGCA')
+
+def _reverseComplement(seq):
+	return seq.translate(_complement)[::-1]
+
+def _addKmers(index, seq, k):
+	'''
+	Adds the k-mers of seq and of its reverse complement to index, so that the reads
+	only have to be looked up on their own strand.
+	'''
+	for s in (seq, _reverseComplement(seq)):
+		for i in range(len(s) - k + 1):
+			index.add(s[i:i+k])
+
+def _hit(index, seq, k):
+	for i in range(len(seq) - k + 1):
+		if seq[i:i+k] in index:
+			return True
+	return False
+
+def referenceKmers(fastaFile, k):
+	'''
+	Index of the k-mers (both strands) of the sequences of fastaFile.
+	'''
+	index = set()
+	seq = []
+	with open(fastaFile, 'rb') as fasta:
+		for line in itertools.chain(fasta, [b'>']):
+			if line.startswith(b'>'):
+				_addKmers(index, b''.join(seq).upper(), k)
+				seq = []
+			else:
+				seq.append(line.strip())
+	return index
+
+def _recruitedKmers(recruited, index, k, maxKmers):
+	'''
+	Returns the k-mers (both strands) of the recruited reads to add to index: the ones
+	found in at least minRecruitedCount reads, which leaves out most sequencing errors,
+	and not made of a few repeated bases, which nuclear reads share as well. At most
+	maxKmers k-mers are returned (counting both strands), the most frequent ones first.
+	'''
+	counts = collections.Counter()
+	for seqs in recruited:
+		kmers = set()
+		for seq in seqs:
+			for i in range(len(seq) - k + 1):
+				kmer = seq[i:i+k]
+				if not kmer in index:
+					kmers.add(min(kmer, _reverseComplement(kmer)))
+		counts.update(kmers)
+	added = set()
+	for kmer, count in sorted(list(counts.items()), key=lambda item: (-item[1], item[0])):
+		if count < minRecruitedCount or len(added) >= maxKmers:
+			break
+		if b'N' in kmer or circularizationCheck.lowComplexity(kmer):
+			continue
+		added.add(kmer)
+		added.add(_reverseComplement(kmer))
+	return added
+
+def _fastq(readFiles):
+	'''
+	Yields the reads of readFiles, one file after the other, as lists of their four lines.
+	'''
+	for readFile in readFiles:
+		with readStreams._open(readFile) as reads:
+			while True:
+				read = [reads.readline() for i in range(4)]
+				if read[0] == b'':
+					break
+				yield [line if line.endswith(b'\n') else line+b'\n' for line in read]
+
+def _chunks(reads, kept, counter):
+	'''
+	Yields the pairs of reads not kept yet, with their numbers, chunkSize at a time.
+	counter[0] is the number of pairs read so far.
+	'''
+	chunk = []
+	for n, pair in enumerate(zip(*[_fastq(files) for files in reads])):
+		counter[0] = n + 1
+		if n in kept:
+			continue
+		chunk.append((n, pair))
+		if len(chunk) == chunkSize:
+			yield chunk
+			chunk = []
+	if len(chunk) > 0:
+		yield chunk
+
+def _baitChunk(chunk):
+	'''
+	Returns the numbers, reads and sequences of the pairs of chunk with a hit in _index.
+	'''
+	hits = []
+	for n, pair in chunk:
+		seqs = [read[1].rstrip().upper() for read in pair]
+		if any(_hit(_index, seq, _k) for seq in seqs):
+			hits.append((n, pair, seqs))
+	return hits
+
+def _results(chunks, threads):
+	'''
+	Yields the hits of each chunk in order, the chunks being searched by threads
+	forked workers. Only a few chunks wait for a worker, so that the reads are not
+	all loaded in memory.
+	'''
+	if threads <= 1:
+		for chunk in chunks:
+			yield _baitChunk(chunk)
+		return
+	with multiprocessing.get_context("fork").Pool(threads) as pool:
+		pending = collections.deque()
+		for chunk in chunks:
+			pending.append(pool.apply_async(_baitChunk, (chunk,)))
+			if len(pending) > 2 * threads:
+				yield pending.popleft().get()
+		while len(pending) > 0:
+			yield pending.popleft().get()
+
+def baitReads(reads, outFiles, fastaFile, k = 31, rounds = 1, threads = 1):
+	'''
+	Keeps the reads sharing at least one k-mer with the sequences of fastaFile.
+	reads holds the files of each mate ([read1 files, read2 files], or [single-end
+	files]) and a pair is kept when one of its reads has a hit; the kept reads of
+	each mate are written to the matching file of outFiles. Each recruitment round
+	then adds the k-mers of the reads just kept to the index and reads the files
+	again to recruit the pairs overlapping them, extending the selection beyond the
+	reference (e.g. into the control region). Only the k-mers shared by several
+	recruited reads and not of low complexity are added, each round adding at most
+	as many k-mers as the reference has (see _recruitedKmers). The reads are searched
+	by threads processes. Returns the number of reads (or pairs) read and kept.
+	'''
+	global _index, _k
+	_index = referenceKmers(fastaFile, k)
+	_k = k
+	referenceSize = len(_index)
+	kept = set() #numbers of the kept pairs
+	outs = [open(outFile, 'wb') for outFile in outFiles]
+	for r in range(rounds + 1):
+		recruited = []
+		counter = [0]
+		for hits in _results(_chunks(reads, kept, counter), threads):
+			for n, pair, seqs in hits:
+				kept.add(n)
+				recruited.append(seqs)
+				for out, read in zip(outs, pair):
+					out.writelines(read)
+		if r == rounds or len(recruited) == 0:
+			break
+		added = _recruitedKmers(recruited, _index, k, referenceSize)
+		if len(added) == 0:
+			break
+		_index.update(added)
+	for out in outs:
+		out.close()
+	_index = None
+	return counter[0], len(kept)
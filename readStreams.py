@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+#Version: 1.4
+#Authors: Allio Remi & Schomaker-Bastos Alex
+#ISEM - CNRS - LAMPADA - IBQM - UFRJ
+
+'''
+Copyright (c) 2019 Remi Allio - ISEM/CNRS & Alex Schomaker-Bastos - LAMPADA/UFRJ
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+'''
+
+
+import gzip, os, shutil, threading
+
+def readFiles(reads):
+	'''
+	Files given to a -1/-2/-s option: several files (e.g. one per library or lane) are
+	separated by commas.
+	'''
+	return [readFile for readFile in reads.split(",") if readFile != ""]
+
+def _open(readFile):
+	with open(readFile, 'rb') as f:
+		compressed = f.read(2) == b'\x1f\x8b'
+	if compressed:
+		return gzip.open(readFile, 'rb')
+	return open(readFile, 'rb')
+
+def streamReads(readFiles, fifo):
+	'''
+	Creates the named pipe fifo and writes the reads of readFiles into it, one file after
+	the other and decompressed on the fly if they are gzip compressed, from a thread. The
+	program given fifo reads them as they come, without a copy of the reads on disk.
+	Returns the thread, to be given to closeStream once the program has ended.
+	'''
+	if os.path.lexists(fifo):
+		os.remove(fifo)
+	os.mkfifo(fifo)
+	def write():
+		try:
+			with open(fifo, 'wb') as out:
+				for readFile in readFiles:
+					with _open(readFile) as reads:
+						shutil.copyfileobj(reads, out, 1 << 20)
+		except BrokenPipeError:
+			pass #the program stopped reading, it failed or was killed
+	thread = threading.Thread(target=write, daemon=True)
+	thread.start()
+	return thread
+
+def closeStream(thread, fifo):
+	'''
+	Waits for the thread writing into fifo and removes fifo. If the program never opened
+	fifo, it is opened here so that the thread does not wait for a reader forever.
+	'''
+	if thread.is_alive():
+		try:
+			os.close(os.open(fifo, os.O_RDONLY | os.O_NONBLOCK))
+		except OSError:
+			pass
+	thread.join()
+	if os.path.lexists(fifo):
+		os.remove(fifo)
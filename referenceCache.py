@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+#Version: 1.4
+#Authors: Allio Remi & Schomaker-Bastos Alex
+#ISEM - CNRS - LAMPADA - IBQM - UFRJ
+
+'''
+Copyright (c) 2019 Remi Allio - ISEM/CNRS & Alex Schomaker-Bastos - LAMPADA/UFRJ
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+'''
+
+import glob, hashlib, json, os, shutil, tempfile
+
+#files built in the working folder from the -r reference, kept in the cache
+cachedFiles = ("translated_genes_for_database.fasta", "contig_id_database.fasta*", "ref_*_database.fasta*", "genes_list")
+
+def referenceKey(refSeqFile, organismType, ignore = False, newGenes = False):
+	'''
+	Returns the cache key of a reference: a hash of the GenBank file content
+	and of the options changing the databases built from it.
+	'''
+	key = hashlib.sha256()
+	with open(refSeqFile, 'rb') as reference:
+		for block in iter(lambda: reference.read(1 << 20), b''):
+			key.update(block)
+	key.update(("\norganism=%s\nignore=%s\nnew-genes=%s\n" % (organismType, ignore, newGenes)).encode())
+	return key.hexdigest()
+
+def restoreReference(cacheFolder, key, pathtowork, faa_filename, databaseFolder):
+	'''
+	Copies the databases cached under key into pathtowork, the reference fasta
+	being renamed faa_filename, and their BLAST volumes into databaseFolder.
+	Returns the index of the entry (reference_count: number of GenBank records
+	in the reference), None if there is nothing cached for key.
+	'''
+	entry = os.path.join(cacheFolder, key)
+	if not os.path.isfile(os.path.join(entry, "genes_list")) or not os.path.isfile(os.path.join(entry, "reference.json")):
+		return None
+	for f in os.listdir(entry):
+		if os.path.isdir(os.path.join(entry, f)) or f == "reference.json": #BLAST databases of the annotation, used from the cache
+			continue
+		folder = pathtowork if f.endswith(".fasta") or f == "genes_list" else databaseFolder
+		if f.startswith("reference.fasta"):
+			shutil.copy(os.path.join(entry, f), os.path.join(folder, faa_filename + f[len("reference.fasta"):]))
+		else:
+			shutil.copy(os.path.join(entry, f), os.path.join(folder, f))
+	return json.load(open(os.path.join(entry, "reference.json")))
+
+def _writeIndex(folder, referenceCount):
+	with open(os.path.join(folder, "reference.json.tmp"), 'w') as index:
+		json.dump({"reference_count": referenceCount}, index, indent=1)
+	os.replace(os.path.join(folder, "reference.json.tmp"), os.path.join(folder, "reference.json"))
+
+def storeReference(cacheFolder, key, pathtowork, faa_filename, databaseFolder, referenceCount):
+	'''
+	Saves the databases built in pathtowork, with their BLAST volumes in
+	databaseFolder, under key, with the number of GenBank records of the
+	reference. The entry is written
+	in a temporary folder and renamed, so that runs sharing the cache never
+	see an incomplete entry.
+	'''
+	entry = os.path.join(cacheFolder, key)
+	if os.path.exists(entry):
+		if not os.path.isfile(os.path.join(entry, "reference.json")): #stored without its index by an older MitoFinder
+			_writeIndex(entry, referenceCount)
+		return
+	if not os.path.exists(cacheFolder):
+		os.makedirs(cacheFolder, exist_ok=True)
+	tmpEntry = tempfile.mkdtemp(prefix=key+".", dir=cacheFolder)
+	for folder in (pathtowork, databaseFolder):
+		for pattern in cachedFiles:
+			for f in glob.glob(os.path.join(folder, pattern)):
+				shutil.copy(f, tmpEntry)
+		for f in glob.glob(os.path.join(folder, faa_filename+"*")):
+			shutil.copy(f, os.path.join(tmpEntry, "reference.fasta" + os.path.basename(f)[len(faa_filename):]))
+	_writeIndex(tmpEntry, referenceCount)
+	try:
+		os.rename(tmpEntry, entry)
+	except OSError: #another run stored the same reference in the meantime
+		shutil.rmtree(tmpEntry)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+#Version: 1.4
+#Authors: Allio Remi & Schomaker-Bastos Alex
+#ISEM - CNRS - LAMPADA - IBQM - UFRJ
+
+'''
+Copyright (c) 2019 Remi Allio - ISEM/CNRS & Alex Schomaker-Bastos - LAMPADA/UFRJ
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+'''
+
+
+from Bio import SeqIO
+from Bio.Alphabet import generic_dna
+from datetime import datetime
+import glob, hashlib, json, os, shlex, shutil, tempfile
+import blastDatabases, geneNames, runReport
+
+libraryFormat = 2
+
+def buildDatabases(gbkFiles, folder, faaFilename, organismType, ignore = False, newGenes = False, logfile = None):
+	'''
+	Reads the CDS and rRNA features of the GenBank files in one pass and writes in
+	folder the files MitoFinder searches: faaFilename (nucleotide sequences of all
+	the features), translated_genes_for_database.fasta, contig_id_database.fasta
+	and one ref_<gene>_database.fasta per gene, genes being given their standard
+	name. Returns the number of nucleotide sequences found, the number of
+	sequences of each gene, the names not recognized (when neither ignore nor
+	newGenes is set) and a summary of each reference.
+	'''
+	def warn(message):
+		print(message)
+		if logfile != None:
+			logfile.write(message+"\n")
+	
+	importantFeaturesFile = open(os.path.join(folder, faaFilename), "w")
+	translatedGene = open(os.path.join(folder, "translated_genes_for_database.fasta"), "w")
+	contigdatabase = open(os.path.join(folder, "contig_id_database.fasta"), "w")
+	geneDatabases = {}
+	genes = {}
+	unknown = {}
+	references = []
+	nucleotideCount = 0
+	
+	def addToGene(name, header, seq):
+		if not name in geneDatabases:
+			geneDatabases[name] = open(os.path.join(folder, "ref_"+name+"_database.fasta"), "w")
+			genes[name] = 0
+		geneDatabases[name].write(header+"@"+name+"\n"+seq+"\n")
+		genes[name] += 1
+	
+	for gbkFile in gbkFiles:
+		for record in SeqIO.parse(open(gbkFile), "genbank", generic_dna):
+			referenceGenes = set()
+			for feature in record.features:
+				if feature.type.lower() != 'cds' and feature.type.lower() != 'rrna':
+					continue
+				if 'gene' in feature.qualifiers:
+					featureName = feature.qualifiers['gene'][0]
+				elif 'product' in feature.qualifiers:
+					featureName = feature.qualifiers['product'][0]
+				else:
+					continue
+				featureName = ''.join(featureName.split())
+				featureSeq = feature.extract(record).seq
+				nucleotides = str(featureSeq).upper()
+				if feature.type.lower() == 'cds':
+					featureName = featureName.replace("/","-")
+				name = geneNames.standardGeneName(featureName)
+				
+				if not "A" in nucleotides and not "C" in nucleotides and not "G" in nucleotides and not "T" in nucleotides:
+					warn("WARNING: no nucleotide sequence have been found for the gene "+str(featureName)+" for the reference "+str(record.id)+".")
+				else:
+					importantFeaturesFile.write('>' + record.id + "@" + featureName + '\n')
+					importantFeaturesFile.write(str(featureSeq)+'\n')
+					nucleotideCount += 1
+					#rRNAs are searched with their nucleotide sequence, the other genes keep the name of the reference for contig identification
+					if name in geneNames.rRNAGenes:
+						addToGene(name, '>' + record.id, str(featureSeq))
+						referenceGenes.add(name)
+						contigdatabase.write('>' + record.id + "@" + name + '\n' + str(featureSeq) + '\n')
+					else:
+						contigdatabase.write('>' + record.id + "@" + featureName + '\n' + str(featureSeq) + '\n')
+				
+				if feature.type.lower() == 'cds':
+					if 'translation' in feature.qualifiers:
+						translation = str(feature.qualifiers['translation'][0])
+					else:
+						translation = str(featureSeq.translate(table=organismType,to_stop=True))
+						warn('		WARNING: Reference did not specify a CDS translation for %s. MitoFinder is creating its own from refSeq' % featureName)
+					translatedGene.write('>' + record.id + "@" + featureName + '\n' + translation + '\n')
+					if name == None:
+						if ignore == False and newGenes == False:
+							unknown[featureName] = featureName
+							continue
+						elif newGenes == True:
+							if not featureName in genes:
+								warn("Gene named \""+featureName+"\" in the reference file is not recognized by MitoFinder.\nMitoFinder will try to annotate it.\n")
+							name = featureName
+						else:
+							if not featureName in unknown:
+								warn("WARNING: Gene named \""+featureName+"\" in the reference file is not recognized by MitoFinder.\nThis gene will not be annotated by MitoFinder\n")
+								unknown[featureName] = featureName
+							continue
+					if not name in geneNames.rRNAGenes:
+						addToGene(name, '>' + record.id, translation)
+						referenceGenes.add(name)
+			references.append({"id": record.id, "organism": record.annotations.get("organism", ""), "length": len(record), "genes": sorted(referenceGenes)})
+	
+	importantFeaturesFile.close()
+	translatedGene.close()
+	contigdatabase.close()
+	for geneOut in list(geneDatabases.values()):
+		geneOut.close()
+	if ignore == True and newGenes == False:
+		unknown = {}
+	#protein genes first, then rRNAs, in the order they were first found (the order of genes_list)
+	genes = dict([(name, count) for name, count in list(genes.items()) if not name in geneNames.rRNAGenes] + [(name, count) for name, count in list(genes.items()) if name in geneNames.rRNAGenes])
+	return nucleotideCount, genes, unknown, references
+
+def buildLibrary(gbkFiles, libraryFolder, organismType, blastFolder, ignore = False, newGenes = False, logfile = None):
+	'''
+	Builds a new version of the reference library in libraryFolder from the
+	GenBank files and makes it the current one. Returns the folder of the new
+	version and the names of the genes not recognized (the version is not built
+	if there are some).
+	'''
+	version = hashlib.sha256()
+	for gbkFile in gbkFiles:
+		with open(gbkFile, 'rb') as reference:
+			for block in iter(lambda: reference.read(1 << 20), b''):
+				version.update(block)
+	version.update(("\norganism=%s\nignore=%s\nnew-genes=%s\nformat=%s\n" % (organismType, ignore, newGenes, libraryFormat)).encode())
+	version = datetime.now().strftime("%Y%m%d") + "-" + version.hexdigest()[:12]
+	if not os.path.exists(libraryFolder):
+		os.makedirs(libraryFolder)
+	if os.path.isdir(os.path.join(libraryFolder, version)):
+		_setCurrent(libraryFolder, version)
+		return os.path.join(libraryFolder, version), {}
+	
+	tmpVersion = tempfile.mkdtemp(prefix=version+".", dir=libraryFolder)
+	try:
+		nucleotideCount, genes, unknown, references = buildDatabases(gbkFiles, tmpVersion, "reference.fasta", organismType, ignore, newGenes, logfile)
+		if nucleotideCount == 0 or len(unknown) > 0:
+			shutil.rmtree(tmpVersion)
+			return None, unknown
+		for database in ("reference.fasta", "contig_id_database.fasta"):
+			command = blastFolder + "makeblastdb -in " + database + " -dbtype nucl"
+			runReport.run(shlex.split(command), cwd=tmpVersion, stdout=open(os.devnull, 'wb'))
+		with open(os.path.join(tmpVersion, "genes_list"), "w") as geneList:
+			for name in genes:
+				geneList.write(name+"\n")
+		if len(references) > 1: #the runs open them in the library
+			blastDatabases.selectionDatabases(tmpVersion, os.path.join(tmpVersion, "blast_databases", "selection"), blastFolder)
+		index = {"format": libraryFormat, "version": version, "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+		"organism_type": organismType, "ignore": ignore, "new_genes": newGenes, "sources": [os.path.abspath(f) for f in gbkFiles],
+		"reference_count": len(references), "genes": genes, "references": references}
+		with open(os.path.join(tmpVersion, "library.json"), "w") as indexFile:
+			json.dump(index, indexFile, indent=1)
+		os.chmod(tmpVersion, 0o755)
+		os.rename(tmpVersion, os.path.join(libraryFolder, version))
+	except:
+		if os.path.exists(tmpVersion):
+			shutil.rmtree(tmpVersion)
+		raise
+	_setCurrent(libraryFolder, version)
+	return os.path.join(libraryFolder, version), {}
+
+def _setCurrent(libraryFolder, version):
+	link = os.path.join(libraryFolder, "current")
+	tmpLink = link + "." + str(os.getpid())
+	os.symlink(version, tmpLink)
+	os.replace(tmpLink, link) #runs reading the library keep a consistent version
+
+def openLibrary(path):
+	'''
+	Returns the folder and the index of the library version at path, which is
+	either a version folder or a library folder (its current version is then used).
+	'''
+	if not os.path.isfile(os.path.join(path, "library.json")):
+		path = os.path.join(path, "current")
+	if not os.path.isfile(os.path.join(path, "library.json")):
+		raise IOError(path + " is not a MitoFinder reference library")
+	path = os.path.realpath(path)
+	index = json.load(open(os.path.join(path, "library.json")))
+	if index.get("format") != libraryFormat:
+		raise IOError(path + " was built by another version of mitofinder-build-library, please build it again")
+	return path, index
+
+def restoreLibrary(versionFolder, pathtowork, faa_filename, databaseFolder):
+	'''
+	Copies the databases of a library version into pathtowork, the reference
+	fasta being renamed faa_filename, and their BLAST volumes into databaseFolder.
+	'''
+	for f in os.listdir(versionFolder):
+		if f == "library.json" or os.path.isdir(os.path.join(versionFolder, f)): #BLAST databases of the annotation, used from the library
+			continue
+		folder = pathtowork if f.endswith(".fasta") or f == "genes_list" else databaseFolder
+		if f.startswith("reference.fasta"):
+			shutil.copy(os.path.join(versionFolder, f), os.path.join(folder, faa_filename + f[len("reference.fasta"):]))
+		else:
+			shutil.copy(os.path.join(versionFolder, f), os.path.join(folder, f))
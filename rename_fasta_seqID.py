@@ -20,19 +20,24 @@ def read_fasta(fp):
             seq.append(line)
     if name: yield (name, ''.join(seq))
 
-seqID=sys.argv[1]
-fout = open(sys.argv[3], 'w')
-c=sys.argv[4]
-direction=sys.argv[5]
-
-resultFile=SeqIO.read(open(sys.argv[2], 'rU'), "fasta", generic_dna)
-if direction == "+":
-	if sys.argv[6] == "yes":
-		fout.write(">"+seqID+"."+str(c)+"\n"+str(resultFile.seq)+"\n")
-	else:
-		fout.write(">"+str(resultFile.id)+"\n"+str(resultFile.seq)+"\n")
-else:
-	if sys.argv[6] == "yes":
-		fout.write(">"+seqID+"."+str(c)+"\n"+str(resultFile.seq.reverse_complement())+"\n")
+def renameFastaSeqID(seqID, resultFile, outputFile, c, direction, rename):
+	'''
+	Writes the contig (a SeqRecord) to outputFile, renamed seqID.c if rename is "yes"
+	and reverse complemented if direction is "-".
+	'''
+	fout = open(outputFile, 'w')
+	if direction == "+":
+		if rename == "yes":
+			fout.write(">"+seqID+"."+str(c)+"\n"+str(resultFile.seq)+"\n")
+		else:
+			fout.write(">"+str(resultFile.id)+"\n"+str(resultFile.seq)+"\n")
 	else:
-		fout.write(">"+str(resultFile.id)+" (reverse)\n"+str(resultFile.seq.reverse_complement())+"\n")
+		if rename == "yes":
+			fout.write(">"+seqID+"."+str(c)+"\n"+str(resultFile.seq.reverse_complement())+"\n")
+		else:
+			fout.write(">"+str(resultFile.id)+" (reverse)\n"+str(resultFile.seq.reverse_complement())+"\n")
+	fout.close()
+
+if __name__ == "__main__":
+	resultFile=SeqIO.read(open(sys.argv[2], 'rU'), "fasta", generic_dna)
+	renameFastaSeqID(sys.argv[1], resultFile, sys.argv[3], sys.argv[4], sys.argv[5], sys.argv[6])
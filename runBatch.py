@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+#Version: 1.4
+#Authors: Allio Remi & Schomaker-Bastos Alex
+#ISEM - CNRS - LAMPADA - IBQM - UFRJ
+
+'''
+Copyright (c) 2019 Remi Allio - ISEM/CNRS & Alex Schomaker-Bastos - LAMPADA/UFRJ
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+'''
+
+'''
+--batch runs each sample in a MitoFinder process of its own, started from the
+options of the batch run. MitoFinder changes its working folder and stops with
+exit() on errors, so the samples cannot share one process; what is built once
+for all of them is the reference databases, through --ref-cache. A sample
+succeeded when its process ends with status 0.
+'''
+
+from subprocess import Popen
+import os, sys, time
+import referenceCache
+
+#manifest columns and the mitofinder options they stand for
+manifestColumns = {"seqid": "-j", "pe1": "-1", "pe2": "-2", "se": "-s", "assembly": "-a", "refseq": "-r"}
+#options given per sample (or split between the samples), not passed as they are to every sample
+sampleOptions = {"-j": True, "--seqid": True, "-1": True, "--Paired-end1": True, "-2": True, "--Paired-end2": True,
+				"-s": True, "--Single-end": True, "-a": True, "--assembly": True, "-p": True, "--processors": True,
+				"-m": True, "--max-memory": True, "--batch": True, "--batch-jobs": True, "--ref-cache": True}
+
+def readManifest(manifest):
+	'''
+	Reads a tab separated manifest whose header names the columns (seqid, pe1, pe2,
+	se, assembly, refseq). Returns a list of dictionaries, one per sample.
+	'''
+	samples = []
+	header = None
+	manifestFolder = os.path.dirname(os.path.abspath(manifest))
+	for line in open(manifest):
+		if line.strip() == "" or line[0] == "#":
+			continue
+		fields = [field.strip() for field in line.rstrip("\n").split("\t")]
+		if header == None:
+			header = [field.lower() for field in fields]
+			for column in header:
+				if column not in manifestColumns:
+					raise ValueError("unknown column \""+column+"\" in "+manifest+" (expected: "+", ".join(manifestColumns)+")")
+			if "seqid" not in header:
+				raise ValueError("the header of "+manifest+" has no seqid column")
+			continue
+		sample = {}
+		for column, field in zip(header, fields):
+			if field != "":
+				if column != "seqid": #several read files can be given separated by commas, as with -1/-2/-s
+					field = ",".join(os.path.join(manifestFolder, f) for f in field.split(","))
+				sample[column] = field
+		if "seqid" not in sample:
+			raise ValueError("sample without seqid in "+manifest+": "+line.rstrip())
+		if not ("pe1" in sample and "pe2" in sample) and "se" not in sample and "assembly" not in sample:
+			raise ValueError("sample "+sample["seqid"]+" has no reads (pe1/pe2 or se) nor assembly")
+		samples.append(sample)
+	return samples
+
+def resolveOption(option, optionStrings):
+	'''
+	Returns the full spelling of option, argparse accepting any unambiguous
+	prefix of a long option (e.g. --proc for --processors).
+	'''
+	if option in optionStrings or not option.startswith("--"):
+		return option
+	candidates = [o for o in optionStrings if o.startswith(option)]
+	if len(candidates) == 1:
+		return candidates[0]
+	return option
+
+def sharedArguments(argv, ownReference, optionStrings = ()):
+	'''
+	Returns the command line options of the batch run that apply to every sample.
+	-r is dropped when the sample gives its own reference. optionStrings are the
+	options of the parser, to recognize the abbreviated ones.
+	'''
+	shared = []
+	skipValue = False
+	for arg in argv:
+		if skipValue == True:
+			skipValue = False
+			continue
+		option = resolveOption(arg.split("=")[0], optionStrings)
+		attached = False
+		if not option.startswith("--") and len(option) > 2 and option[:2] in sampleOptions: #-p8
+			option = option[:2]
+			attached = True
+		if option in sampleOptions or (ownReference == True and option in ("-r", "--refseq")):
+			skipValue = "=" not in arg and attached == False
+			continue
+		shared.append(arg)
+	return shared
+
+def referenceReady(reference, refCache, referenceOptions, keys):
+	'''
+	True once the databases of reference are in refCache, or when there is nothing
+	to build (reference library, or a missing file the sample will report). keys
+	keeps the cache key of each reference, computed once.
+	'''
+	if os.path.isdir(reference) or not os.path.isfile(reference):
+		return True
+	if not reference in keys:
+		keys[reference] = referenceCache.referenceKey(reference, *referenceOptions)
+	return os.path.isfile(os.path.join(refCache, keys[reference], "genes_list"))
+
+def runBatch(manifest, argv, processorsToUse = 4, maxMemory = "", jobs = 1, refCache = "", logfile = None,
+		optionStrings = (), reference = "", referenceOptions = ("", False, False)):
+	'''
+	Runs MitoFinder on every sample of the manifest, jobs samples at a time, splitting
+	the -p threads and -m memory between them. Samples share the reference databases
+	through refCache: the first sample of each reference builds them while the other
+	samples using that reference wait until they are stored in refCache. reference is
+	the -r reference of the samples without one in the manifest, referenceOptions the
+	genetic code, --ignore and --new-genes options the cache key depends on. Returns
+	the list of samples that failed.
+	'''
+	samples = readManifest(manifest)
+	mitofinder = os.path.abspath(sys.argv[0])
+	jobs = max(1, min(jobs, processorsToUse, len(samples)))
+	threads = max(1, processorsToUse // jobs)
+	memory = ""
+	if maxMemory != "":
+		memory = str(max(1, int(float(maxMemory)) // jobs))
+	
+	print("Running "+str(len(samples))+" samples, "+str(jobs)+" at a time, with "+str(threads)+" threads each\n")
+	if logfile != None:
+		logfile.write("Running "+str(len(samples))+" samples, "+str(jobs)+" at a time, with "+str(threads)+" threads each\n\n")
+	
+	pending = list(samples)
+	running = {}
+	builtReferences = set()
+	buildingReferences = {} #reference -> seqid of the sample building its databases
+	keys = {}
+	failed = []
+	while len(pending) > 0 or len(running) > 0:
+		#the other samples of a reference start as soon as its databases are in the cache
+		for ref, seqid in list(buildingReferences.items()):
+			if referenceReady(ref, refCache, referenceOptions, keys):
+				del buildingReferences[ref]
+				builtReferences.add(ref)
+		#start as many samples as allowed, waiting for the databases of a reference being built
+		for sample in list(pending):
+			if len(running) >= jobs:
+				break
+			sampleReference = sample.get("refseq", reference)
+			if sampleReference in buildingReferences:
+				continue
+			command = [sys.executable, mitofinder] + sharedArguments(argv, "refseq" in sample, optionStrings) + ["-j", sample["seqid"], "-p", str(threads), "--ref-cache", refCache]
+			if memory != "":
+				command += ["-m", memory]
+			for column in ("pe1", "pe2", "se", "assembly", "refseq"):
+				if column in sample:
+					command += [manifestColumns[column], sample[column]]
+			out = open(sample["seqid"]+"_batch.log", "w")
+			running[sample["seqid"]] = (Popen(command, stdout=out, stderr=out), sample, out)
+			if sampleReference not in builtReferences and not referenceReady(sampleReference, refCache, referenceOptions, keys):
+				buildingReferences[sampleReference] = sample["seqid"]
+			pending.remove(sample)
+			print("Started "+sample["seqid"])
+		
+		time.sleep(1)
+		for seqid, (process, sample, out) in list(running.items()):
+			if process.poll() == None:
+				continue
+			out.close()
+			del running[seqid]
+			sampleReference = sample.get("refseq", reference)
+			if buildingReferences.get(sampleReference) == seqid: #ended before storing the databases, the next sample builds them
+				del buildingReferences[sampleReference]
+			if process.returncode == 0:
+				print("Finished "+seqid)
+				if logfile != None:
+					logfile.write("Finished "+seqid+"\n")
+			else:
+				print("ERROR: "+seqid+" failed, see "+seqid+"_batch.log")
+				if logfile != None:
+					logfile.write("ERROR: "+seqid+" failed, see "+seqid+"_batch.log\n")
+				failed.append(seqid)
+	return failed
@@ -26,7 +26,8 @@ SOFTWARE.
 '''
 
 from subprocess import Popen
-import gzip
+import runReport, readStreams
+import threading
 import subprocess
 import time
 import shlex, os, shutil, FirstBuildChecker
@@ -83,70 +84,60 @@ def runIDBA(processName = 'teste', shortestContig = 100, inputFile = 'teste.inpu
 							if configPart == 'type':
 								t=line.replace('\n','').replace(' ','').split('=')[-1]
 							if configPart == 'q1':
-								read1=line.replace('\n','').replace(' ','').split('=')[-1]
-								if not "/" in read1:
-									read1="../"+read1
-								if read1[-3:] == ".gz":
-									with gzip.open(read1, 'rb') as f_in:
-										with open(read1[0:-3], 'wb') as f_out:
-											shutil.copyfileobj(f_in, f_out)
-									read1=read1[0:-3]
+								read1=readStreams.readFiles(line.replace('\n','').replace(' ','').split('=')[-1])
+								read1=[r if "/" in r else "../"+r for r in read1]
 							if configPart == 'q2':
-								read2=line.replace('\n','').replace(' ','').split('=')[-1]
-								if not "/" in read2:
-									read2="../"+read2
-								if read2[-3:] == ".gz":
-									with gzip.open(read2, 'rb') as f_in:
-										with open(read2[0:-3], 'wb') as f_out:
-											shutil.copyfileobj(f_in, f_out)
-									read2=read2[0:-3]
+								read2=readStreams.readFiles(line.replace('\n','').replace(' ','').split('=')[-1])
+								read2=[r if "/" in r else "../"+r for r in read2]
 	
-
+		#the reads are decompressed, converted by fq2fa and read by IDBA-UD through named pipes,
+		#without being written to disk
 		with open(pathToWork + 'idba.log','a') as idbaLogFile:
+			streams = []
+			fastq1 = processName+"_idba_read_1.fastq"
+			streams.append((readStreams.streamReads(read1, fastq1), fastq1))
+			read=processName+"_idba_read.fasta"
 			if t == "PE":
 				print("Paired-end")
 				logfile.write("Paired-end"+"\n")
-				read=processName+"_idba_read.fasta"
-				command = '%sfq2fa --merge --filter %s %s %s' %(pathToIdba, read1, read2, read)
-				print("Preparing data for IDBA-UD assembly") 
-				logfile.write("Preparing data for IDBA-UD assembly"+"\n")
-				fq2fa = Popen(command, stdout=idbaLogFile, stderr=idbaLogFile, shell=True)
-				fq2fa.wait()
-				if not os.path.isfile(pathToWork+"/"+read) == True:
-					print("\n ERROR: IDBA-UD didn't run well")
-					print("Please check log file : "+ pathToWork + 'idba.log')
-					logfile.write("\n ERROR: IDBA-UD didn't run well"+"\n"+"Please check log file : "+ pathToWork + 'idba.log'+"\n")
-					exit()
-				command = '%sidba -r %s -o %s --num_threads %s' %(pathToIdba, read, out, processorsToUse)
-				print("Running assembly") 
-				idba = Popen(command, stdout=idbaLogFile, stderr=idbaLogFile, shell=True)
-				idba.wait()
-				#copyfile(pathToWork+"/"+out+"/contig.fa", pathToWork+"/"+processName+".scafSeq")
-				
+				fastq2 = processName+"_idba_read_2.fastq"
+				streams.append((readStreams.streamReads(read2, fastq2), fastq2))
+				command = '%sfq2fa --merge --filter %s %s %s' %(pathToIdba, fastq1, fastq2, read)
 			if t == "SE":
 				print("Single-end")
 				logfile.write("Single-end"+"\n")
-				read=processName+"_idba_read.fasta"
-				command = '%sfq2fa --filter %s %s' %(pathToIdba, read1, read)
-				print("Preparing data for IDBA-UD assembly") 
-				logfile.write("Preparing data for IDBA-UD assembly"+"\n")
-				fq2fa = Popen(command, stdout=idbaLogFile, stderr=idbaLogFile, shell=True)
-				fq2fa.wait()
-				if not os.path.isfile(pathToWork+"/"+read) == True:
-					print("\n ERROR : IDBA-UD didn't run well")
-					print("Please check log file : "+ pathToWork + 'idba.log')
-					logfile.write("\n ERROR: IDBA-UD didn't run well"+"\n"+"Please check log file : "+ pathToWork + 'idba.log'+"\n")
-					exit()
-				command = '%sidba -r %s -o %s --num_threads %s' %(pathToIdba, read, out, processorsToUse)
-				print("Running assembly")
-				logfile.write("Running assembly"+"\n") 
-				idba = Popen(command, stdout=idbaLogFile, stderr=idbaLogFile, shell=True)
-				idba.wait()
-				#copyfile(pathToWork+"/"+out+"/contig.fa", pathToWork+"/"+processName+".scafSeq")
-	
-		with gzip.open(read+'.gz', 'wb') as f:
-			f.write(read)
+				command = '%sfq2fa --filter %s %s' %(pathToIdba, fastq1, read)
+			if os.path.lexists(read):
+				os.remove(read)
+			os.mkfifo(read)
+			print("Preparing data for IDBA-UD assembly") 
+			logfile.write("Preparing data for IDBA-UD assembly"+"\n")
+			fq2fa = []
+			def convert(command):
+				fq2fa.append(runReport.run(command, stdout=idbaLogFile, stderr=idbaLogFile, shell=True))
+				try: #if fq2fa failed before opening read, IDBA-UD gets an empty input instead of waiting for it:
+					#this open waits for IDBA-UD to open read, even if it has not done it yet
+					os.close(os.open(read, os.O_WRONLY))
+				except OSError:
+					pass
+			fq2faThread = threading.Thread(target=convert, args=(command,))
+			fq2faThread.start()
+			command = '%sidba -r %s -o %s --num_threads %s' %(pathToIdba, read, out, processorsToUse)
+			print("Running assembly")
+			logfile.write("Running assembly"+"\n") 
+			idba = runReport.run(command, stdout=idbaLogFile, stderr=idbaLogFile, shell=True)
+			while fq2faThread.is_alive(): #IDBA-UD ended without reading the reads, fq2fa or the open above still wait for it
+				os.close(os.open(read, os.O_RDONLY | os.O_NONBLOCK))
+				fq2faThread.join(0.1)
+			for thread, fastq in streams:
+				readStreams.closeStream(thread, fastq)
 			os.remove(read)
+			if fq2fa[0].returncode != 0:
+				print("\n ERROR: IDBA-UD didn't run well")
+				print("Please check log file : "+ pathToWork + 'idba.log')
+				logfile.write("\n ERROR: IDBA-UD didn't run well"+"\n"+"Please check log file : "+ pathToWork + 'idba.log'+"\n")
+				exit(1)
+			#copyfile(pathToWork+"/"+out+"/contig.fa", pathToWork+"/"+processName+".scafSeq")
 	logfile.close()
 
 
@@ -26,6 +26,7 @@ SOFTWARE.
 '''
 
 from subprocess import Popen
+import runReport, readStreams
 import subprocess
 import time
 import shlex, os, shutil, FirstBuildChecker
@@ -67,14 +68,16 @@ def runMegahit(processName = 'teste', shortestContig = 100, inputFile = 'teste.i
 				if configPart == 'type':
 					t=line.replace('\n','').replace(' ','').split('=')[-1]
 				if configPart == 'q1':
-					read1=line.replace('\n','').replace(' ','').split('=')[-1]
-					if not "/" in read1:
-						read1="../"+read1
+					read1=readStreams.readFiles(line.replace('\n','').replace(' ','').split('=')[-1])
+					read1=[r if "/" in r else "../"+r for r in read1]
 				if configPart == 'q2':
-					read2=line.replace('\n','').replace(' ','').split('=')[-1]
-					if not "/" in read2:
-						read2="../"+read2
+					read2=readStreams.readFiles(line.replace('\n','').replace(' ','').split('=')[-1])
+					read2=[r if "/" in r else "../"+r for r in read2]
 								
+	#MEGAHIT takes comma-separated lists of (gzip compressed or not) files, the files of several libraries are given as they are
+	read1=",".join(read1)
+	if t == "PE":
+		read2=",".join(read2)
 	#try:
 	out=processName+"_megahit"
 	megahit="yes"
@@ -96,13 +99,12 @@ def runMegahit(processName = 'teste', shortestContig = 100, inputFile = 'teste.i
 					command = '%smegahit -1 %s -2 %s -o %s --out-prefix %s --min-contig-len %s -t %s' %(pathToMegahit, read1, read2, out, out, shortestContig, processorsToUse)
 				else:
 					command = '%smegahit -1 %s -2 %s -o %s --out-prefix %s --min-contig-len %s -t %s -m %s000000000' %(pathToMegahit, read1, read2, out, out, shortestContig, processorsToUse, maxMemory)
-				megahit = Popen(command, stdout=megahitLogFile, stderr=megahitLogFile, shell=True)
-				megahit.wait()
+				megahit = runReport.run(command, stdout=megahitLogFile, stderr=megahitLogFile, shell=True)
 				if not os.path.isfile(pathToWork+"/"+out+"/"+out+".contigs.fa") == True:
 					print("\n ERROR: MEGAHIT didn't run well")
 					print("Please check log file : "+ pathToWork + 'megahit.log')
 					logfile.write("\n ERROR: MEGAHIT didn't run well"+"\n"+"Please check log file : "+ pathToWork + 'megahit.log'+"\n")
-					exit()
+					exit(1)
 				#copyfile(pathToWork+"/"+out+"/"+out+".contigs.fa", pathToWork+"/"+processName+".scafSeq")
 				#check Megahit output to see if reference sequence was built	
 				
@@ -112,13 +114,12 @@ def runMegahit(processName = 'teste', shortestContig = 100, inputFile = 'teste.i
 					command = '%smegahit -r %s -o %s --out-prefix %s --min-contig-len %s -t %s' %(pathToMegahit, read1, processName+"_megahit", processName+"_megahit", shortestContig, processorsToUse)
 				else:
 					command = '%smegahit -r %s -o %s --out-prefix %s --min-contig-len %s -t %s -m %s000000000' %(pathToMegahit, read1, processName+"_megahit", processName+"_megahit", shortestContig, processorsToUse, maxMemory)
-				megahit = Popen(command, stdout=megahitLogFile, stderr=megahitLogFile, shell=True)
-				megahit.wait()
+				megahit = runReport.run(command, stdout=megahitLogFile, stderr=megahitLogFile, shell=True)
 				if not os.path.isfile(pathToWork+"/"+out+"/"+out+".contigs.fa") == True:
 					print("\n MEGAHIT didn't run well")
 					print("Please check log file : "+ pathToWork + 'megahit.log')
 					logfile.write("\n ERROR: MEGAHIT didn't run well"+"\n"+"Please check log file : "+ pathToWork + 'megahit.log'+"\n")
-					exit()
+					exit(1)
 				#copyfile(pathToWork+"/"+out+"/"+out+".contigs.fa", pathToWork+"/"+processName+".scafSeq")
 
 	logfile.close()
@@ -26,12 +26,27 @@ SOFTWARE.
 '''
 
 from subprocess import Popen
+import runReport, readStreams
 import subprocess
 import time
 import shlex, os, shutil, FirstBuildChecker
 from shutil import copyfile
 
 
+def datasetFile(fileName, t, read1, read2):
+	'''
+	Writes the SPAdes dataset file fileName of one library (t = "PE" or "SE") made of the
+	read files read1 (and read2). Returns fileName.
+	'''
+	def files(reads):
+		return "[" + ", ".join('"'+os.path.abspath(r)+'"' for r in reads) + "]"
+	with open(fileName, 'w') as dataset:
+		if t == "PE":
+			dataset.write('[\n  {\n    orientation: "fr",\n    type: "paired-end",\n    left reads: '+files(read1)+',\n    right reads: '+files(read2)+'\n  }\n]\n')
+		else:
+			dataset.write('[\n  {\n    type: "single",\n    single reads: '+files(read1)+'\n  }\n]\n')
+	return fileName
+
 def runMetaspades(processName = 'teste', shortestContig = 100, inputFile = 'teste.input', processorsToUse = 4,
 					metaspadesFolder= 'installed', refSeqFile = None, organismType = 2,
 					blastFolder = 'installed', maxMemory="", logfile='logfile', override=False):
@@ -67,14 +82,19 @@ def runMetaspades(processName = 'teste', shortestContig = 100, inputFile = 'test
 					if configPart == 'type':
 						t=line.replace('\n','').replace(' ','').split('=')[-1]
 					if configPart == 'q1':
-						read1=line.replace('\n','').replace(' ','').split('=')[-1]
-						if not "/" in read1:
-							read1="../"+read1
+						read1=readStreams.readFiles(line.replace('\n','').replace(' ','').split('=')[-1])
+						read1=[r if "/" in r else "../"+r for r in read1]
 					if configPart == 'q2':
-						read2=line.replace('\n','').replace(' ','').split('=')[-1]
-						if not "/" in read2:
-							read2="../"+read2
+						read2=readStreams.readFiles(line.replace('\n','').replace(' ','').split('=')[-1])
+						read2=[r if "/" in r else "../"+r for r in read2]
 								
+	#SPAdes reads its input several times, several files are given in a dataset file rather than streamed
+	if len(read1) == 1 and t == "PE":
+		reads='-1 %s -2 %s' %(read1[0], read2[0])
+	elif len(read1) == 1:
+		reads='-s %s' %(read1[0])
+	else:
+		reads='--dataset %s' %(datasetFile(processName+"_metaspades_dataset.yaml", t, read1, read2 if t == "PE" else []))
 	#try:
 	out=processName+"_metaspades"
 	metaspades="yes"
@@ -93,32 +113,30 @@ def runMetaspades(processName = 'teste', shortestContig = 100, inputFile = 'test
 		with open(pathToWork + 'metaspades.log','w') as metaspadesLogFile:
 			if t == "PE":
 				if maxMemory == "":
-					command = '%smetaspades.py -1 %s -2 %s -o %s -t %s' %(pathToMetaspades, read1, read2, out, processorsToUse)
+					command = '%smetaspades.py %s -o %s -t %s' %(pathToMetaspades, reads, out, processorsToUse)
 				else:
-					command = '%smetaspades.py -1 %s -2 %s -o %s -t %s -m %s' %(pathToMetaspades, read1, read2, out, processorsToUse, maxMemory)
-				metaspades = Popen(command, stdout=metaspadesLogFile, stderr=metaspadesLogFile, shell=True)
-				metaspades.wait()
+					command = '%smetaspades.py %s -o %s -t %s -m %s' %(pathToMetaspades, reads, out, processorsToUse, maxMemory)
+				metaspades = runReport.run(command, stdout=metaspadesLogFile, stderr=metaspadesLogFile, shell=True)
 				if not os.path.isfile(pathToWork+"/"+out+"/"+"scaffolds.fasta") == True:
 					print("\n ERROR: MetaSPAdes didn't run well")
 					print("Please check log file : "+ pathToWork + 'metaspades.log')
 					logfile.write("\n ERROR: MetaSPAdes didn't run well"+"\n"+"Please check log file : "+ pathToWork + 'metaspades.log'+"\n")
-					exit()
+					exit(1)
 				#copyfile(pathToWork+"/"+out+"/"+"scaffolds.fasta", pathToWork+"/"+processName+".scafSeq")
 				#check Megahit output to see if reference sequence was built	
 				
 			
 			if t == "SE":
 				if maxMemory == "":
-					command = '%smetaspades.py -s %s -o %s -t %s' %(pathToMetaspades, read1, out, processorsToUse)
+					command = '%smetaspades.py %s -o %s -t %s' %(pathToMetaspades, reads, out, processorsToUse)
 				else:
-					command = '%smetaspades.py -s %s -o %s -t %s -m %s' %(pathToMetaspades, read1, out, processorsToUse, maxMemory)
-				metaspades = Popen(command, stdout=metaspadesLogFile, stderr=metaspadesLogFile, shell=True)
-				metaspades.wait()
+					command = '%smetaspades.py %s -o %s -t %s -m %s' %(pathToMetaspades, reads, out, processorsToUse, maxMemory)
+				metaspades = runReport.run(command, stdout=metaspadesLogFile, stderr=metaspadesLogFile, shell=True)
 				if not os.path.isfile(pathToWork+"/"+out+"/"+"scaffolds.fasta") == True:
 					print("\n MetaSPAdes didn't run well")
 					print("Please check log file : "+ pathToWork + 'metaspades.log')
 					logfile.write("\n MetaSPAdes didn't run well"+"\n"+"Please check log file : "+ pathToWork + 'metaspades.log'+"\n")
-					exit()
+					exit(1)
 				#copyfile(pathToWork+"/"+out+"/"+"scaffolds.fasta", pathToWork+"/"+processName+".scafSeq")
 	
 	logfile.close()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+#Version: 1.4
+#Authors: Allio Remi & Schomaker-Bastos Alex
+#ISEM - CNRS - LAMPADA - IBQM - UFRJ
+
+'''
+Copyright (c) 2019 Remi Allio - ISEM/CNRS & Alex Schomaker-Bastos - LAMPADA/UFRJ
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+'''
+
+
+import atexit, json, os, resource, shlex, time
+from subprocess import Popen, PIPE
+
+#set by startReport, inherited by the processes forked for the annotation
+_prefix = None
+_owner = None
+_start = None
+_stage = None
+
+def _cpu():
+	'''
+	CPU time (user + system) of MitoFinder and of all its finished child processes.
+	'''
+	cpu = 0.0
+	for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+		usage = resource.getrusage(who)
+		cpu += usage.ru_utime + usage.ru_stime
+	return cpu
+
+def _peakRss():
+	return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+def _write(event):
+	if _prefix == None:
+		return
+	with open(_prefix + "_report.events", 'a') as events: #one line per write, processes annotating other contigs append to the same file
+		events.write(json.dumps(event) + "\n")
+
+def startReport(prefix):
+	'''
+	Starts recording the stages and the external commands of this run. The report
+	is written to prefix_report.json and prefix_report.tsv when MitoFinder exits.
+	'''
+	global _prefix, _owner, _start
+	_prefix = prefix
+	_owner = os.getpid()
+	_start = (time.time(), _cpu())
+	open(_prefix + "_report.events", 'w').close()
+	atexit.register(writeReport)
+
+def stage(name):
+	'''
+	Ends the running stage, if any, and starts stage name.
+	'''
+	global _stage
+	endStage()
+	_stage = (name, time.time(), _cpu())
+
+def endStage():
+	global _stage
+	if _stage == None:
+		return
+	name, start, cpu = _stage
+	_stage = None
+	_write({"type": "stage", "stage": name, "start": start, "wall": time.time() - start, "cpu": _cpu() - cpu, "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss})
+
+def run(command, **kwargs):
+	'''
+	Runs Popen(command, **kwargs) until the end of the process and records its
+	command line, wall time, CPU time and peak RSS. Returns the finished Popen.
+	'''
+	start = time.time()
+	process = Popen(command, **kwargs)
+	pid, status, usage = os.wait4(process.pid, 0)
+	process.returncode = os.waitstatus_to_exitcode(status)
+	if not isinstance(command, str):
+		command = shlex.join(command)
+	_write({"type": "command", "stage": _stage[0] if _stage != None else "", "start": start, "wall": time.time() - start,
+	"cpu": usage.ru_utime + usage.ru_stime, "peak_rss_kb": usage.ru_maxrss, "exit_status": process.returncode,
+	"cwd": os.path.abspath(kwargs.get("cwd") or os.getcwd()), "command": command})
+	return process
+
+def runLines(command, outputFile = None, **kwargs):
+	'''
+	Runs command and yields the lines it writes on its standard output as they
+	arrive, copying them to outputFile if it is given. The command is recorded
+	like with run once its output is read.
+	'''
+	start = time.time()
+	process = Popen(command, stdout=PIPE, universal_newlines=True, **kwargs)
+	out = None
+	if outputFile != None:
+		out = open(outputFile, 'w')
+	finished = False
+	try:
+		for line in process.stdout:
+			if out != None:
+				out.write(line)
+			yield line
+		finished = True
+	finally:
+		if out != None:
+			out.close()
+		process.stdout.close()
+		if finished == False: #the caller stopped reading
+			process.kill()
+		pid, status, usage = os.wait4(process.pid, 0)
+		process.returncode = os.waitstatus_to_exitcode(status)
+		if not isinstance(command, str):
+			command = shlex.join(command)
+		_write({"type": "command", "stage": _stage[0] if _stage != None else "", "start": start, "wall": time.time() - start,
+		"cpu": usage.ru_utime + usage.ru_stime, "peak_rss_kb": usage.ru_maxrss, "exit_status": process.returncode,
+		"cwd": os.path.abspath(kwargs.get("cwd") or os.getcwd()), "command": command})
+
+def writeReport():
+	'''
+	Writes the JSON and TSV reports from the recorded events.
+	'''
+	global _prefix
+	if _prefix == None or os.getpid() != _owner:
+		return
+	endStage()
+	stages = []
+	commands = []
+	with open(_prefix + "_report.events") as events:
+		for line in events:
+			try:
+				event = json.loads(line)
+			except ValueError:
+				continue
+			if event["type"] == "stage":
+				event["commands"] = []
+				stages.append(event)
+			else:
+				commands.append(event)
+	stages.sort(key=lambda s: s["start"])
+	for command in sorted(commands, key=lambda c: c["start"]):
+		for s in stages:
+			if s["stage"] == command["stage"]:
+				s["commands"].append(command)
+				#MitoFinder's own peak RSS is a high-water mark, the one of the stage is the largest of it and of its commands
+				s["peak_rss_kb"] = max(s["peak_rss_kb"], command["peak_rss_kb"])
+				break
+	total = {"wall": time.time() - _start[0], "cpu": _cpu() - _start[1], "peak_rss_kb": _peakRss()}
+	with open(_prefix + "_report.json", 'w') as report:
+		json.dump({"total": total, "stages": stages, "unstaged_commands": [c for c in commands if not c["stage"] in [s["stage"] for s in stages]]}, report, indent=1)
+	with open(_prefix + "_report.tsv", 'w') as report:
+		report.write("type\tstage\twall_time_s\tcpu_time_s\tpeak_rss_kb\texit_status\tcommand\n")
+		for s in stages:
+			report.write("stage\t%s\t%.2f\t%.2f\t%d\t\t\n" %(s["stage"], s["wall"], s["cpu"], s["peak_rss_kb"]))
+			for c in s["commands"]:
+				report.write("command\t%s\t%.2f\t%.2f\t%d\t%d\t%s\n" %(c["stage"], c["wall"], c["cpu"], c["peak_rss_kb"], c["exit_status"], c["command"]))
+		report.write("total\t\t%.2f\t%.2f\t%d\t\t\n" %(total["wall"], total["cpu"], total["peak_rss_kb"]))
+	os.remove(_prefix + "_report.events")
+	_prefix = None
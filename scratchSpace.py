@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+#Version: 1.4
+#Authors: Allio Remi & Schomaker-Bastos Alex
+#ISEM - CNRS - LAMPADA - IBQM - UFRJ
+
+'''
+Copyright (c) 2019 Remi Allio - ISEM/CNRS & Alex Schomaker-Bastos - LAMPADA/UFRJ
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+'''
+
+
+import atexit, errno, os, shutil, tempfile
+
+#set by startScratch, inherited by the processes forked for the annotation
+_scratch = None
+_owner = None
+
+def startScratch(scratchDir, processName):
+	'''
+	Creates the scratch folder of this run in scratchDir (e.g. a node-local disk or
+	/dev/shm), where the intermediate files are written from now on. The folder is
+	removed when MitoFinder exits. Returns its path.
+	'''
+	global _scratch, _owner
+	os.makedirs(scratchDir, exist_ok=True)
+	_scratch = tempfile.mkdtemp(prefix=processName+"_MitoFinder_", dir=scratchDir)
+	_owner = os.getpid()
+	atexit.register(removeScratch)
+	return _scratch
+
+def removeScratch():
+	global _scratch
+	if _scratch == None or os.getpid() != _owner:
+		return
+	shutil.rmtree(_scratch, ignore_errors=True)
+	_scratch = None
+
+def folder(name, default):
+	'''
+	Path of the intermediate folder name: in the scratch folder if there is one, in
+	default otherwise.
+	'''
+	if _scratch == None:
+		return os.path.join(default, name)
+	return os.path.join(_scratch, name)
+
+def move(path, destination):
+	'''
+	Moves the file or folder path into the folder destination. It is a rename when both
+	are on the same file system; otherwise path is copied under a temporary name in
+	destination and renamed, so that destination never holds a partial copy.
+	'''
+	target = os.path.join(destination, os.path.basename(path))
+	try:
+		os.replace(path, target)
+		return target
+	except OSError as e:
+		if e.errno != errno.EXDEV:
+			raise
+	partial = os.path.join(destination, "."+os.path.basename(path)+".moving")
+	if os.path.isdir(path):
+		shutil.copytree(path, partial)
+		os.replace(partial, target)
+		shutil.rmtree(path)
+	else:
+		shutil.copy(path, partial)
+		os.replace(partial, target)
+		os.remove(path)
+	return target
+
+def keep(path, destination, retention):
+	'''
+	Applies the --keep-intermediates policy to the intermediate file path: moved into
+	destination with "tmp", deleted with "none".
+	'''
+	if retention == "none":
+		if os.path.isdir(path):
+			shutil.rmtree(path)
+		else:
+			os.remove(path)
+	else:
+		move(path, destination)
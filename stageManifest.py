@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+#Version: 1.4
+#Authors: Allio Remi & Schomaker-Bastos Alex
+#ISEM - CNRS - LAMPADA - IBQM - UFRJ
+
+'''
+Copyright (c) 2019 Remi Allio - ISEM/CNRS & Alex Schomaker-Bastos - LAMPADA/UFRJ
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+'''
+
+import hashlib, json, os
+import scratchSpace
+
+def fileHash(path):
+	'''
+	Returns the sha256 of the content of path, or None if it does not exist.
+	'''
+	if not os.path.isfile(path):
+		return None
+	digest = hashlib.sha256()
+	with open(path, 'rb') as f:
+		for block in iter(lambda: f.read(1 << 20), b''):
+			digest.update(block)
+	return digest.hexdigest()
+
+def fileStamp(path):
+	'''
+	Returns the size and modification time of path, or None if it does not exist.
+	Used instead of fileHash for the large inputs (the reads) that are only read.
+	'''
+	if not os.path.isfile(path):
+		return None
+	stat = os.stat(path)
+	return "%d:%d" % (stat.st_size, stat.st_mtime_ns)
+
+class StageManifest:
+	'''
+	Per-sample record of the pipeline stages already done. For each stage it keeps
+	the hashes of the input files, the parameters, and the hashes of the files the
+	stage produced, in a JSON file of the working folder. A restarted run skips the
+	stages whose record still matches; as the inputs of a stage are the outputs of
+	the previous ones, everything after the first stale stage is run again.
+	'''
+	def __init__(self, manifestFile, ignore = False):
+		self.manifestFile = manifestFile
+		self.stages = {}
+		if ignore == False and os.path.isfile(manifestFile):
+			try:
+				self.stages = json.load(open(manifestFile))
+			except ValueError: #truncated by a preempted run, start again
+				self.stages = {}
+
+	def _inputs(self, inputs, params, stampedInputs = ()):
+		record = {"inputs": dict((f, fileHash(f)) for f in inputs), "params": params}
+		record["inputs"].update((f, fileStamp(f)) for f in stampedInputs)
+		return record
+
+	def done(self, stage, inputs, params, stampedInputs = ()):
+		'''
+		True if stage was recorded with the same inputs and parameters and its
+		outputs are unchanged. The stampedInputs are compared by size and
+		modification time instead of content. The outputs moved by the cleaning of the previous
+		run (see moved) are put back where the stage wrote them.
+		'''
+		record = self.stages.get(stage)
+		if record == None or record["inputs"] != self._inputs(inputs, params, stampedInputs)["inputs"] or record["params"] != params:
+			return False
+		moved = record.get("moved", {})
+		for f, digest in list(record["outputs"].items()):
+			if fileHash(moved.get(f, f)) != digest:
+				return False
+		if len(moved) > 0:
+			for f, current in list(moved.items()):
+				scratchSpace.move(current, os.path.dirname(f))
+			del record["moved"]
+			self.save()
+		return True
+
+	def record(self, stage, inputs, params, outputs, stampedInputs = ()):
+		'''
+		Records stage as done and saves the manifest.
+		'''
+		record = self._inputs(inputs, params, stampedInputs)
+		record["outputs"] = dict((os.path.normpath(f), fileHash(f)) for f in outputs)
+		self.stages[stage] = record
+		self.save()
+
+	def moved(self, path, destination):
+		'''
+		Notes that the output path of a stage was moved into the folder destination,
+		where done looks for it. Saved by the next save.
+		'''
+		path = os.path.normpath(path)
+		for record in list(self.stages.values()):
+			if path in record["outputs"]:
+				record.setdefault("moved", {})[path] = os.path.join(destination, os.path.basename(path))
+
+	def save(self):
+		tmpFile = self.manifestFile + ".tmp"
+		with open(tmpFile, 'w') as manifest:
+			json.dump(self.stages, manifest, indent=1, sort_keys=True)
+		os.replace(tmpFile, self.manifestFile)
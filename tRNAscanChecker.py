@@ -29,6 +29,7 @@ from Bio import SeqIO
 from Bio.Alphabet import generic_dna, generic_protein, IUPAC
 from Bio.Data import CodonTable
 from subprocess import Popen
+import runReport
 import shlex, sys, os
 
 class Assembly():
@@ -192,10 +193,20 @@ class Assembly():
 		def score(self):
 			return self.tRNAscore
 
+def addToEnvironment(variable, folder):
+	'''
+	Appends folder to the environment variable unless it is already there, tRNAscanCheck
+	being called for every contig by the same process.
+	'''
+	if not folder in os.environ[variable].split(os.pathsep):
+		os.environ[variable] += os.pathsep + folder
+
 def tRNAscanCheck(resultFile = None, hasCircularized = False, skipTRNA = False, organismType = 2, coveCutOff = 7,
-                  buildBacteria = False, buildArchea = False, tRNAscan="mitfi"):
+                  buildBacteria = False, buildArchea = False, tRNAscan="mitfi", tRNAFolder = None):
 	'''
 	Use tRNAscan-SE to look for tRNAs and hold it's positions and scores in the tRNA Class.
+	tRNAFolder is the folder of the chosen tRNA annotator, as already resolved by the caller;
+	when it is None the folder is read from Mitofinder.config.
 	'''
 	if skipTRNA == False:
 		module_dir = os.path.dirname(__file__)
@@ -213,44 +224,47 @@ def tRNAscanCheck(resultFile = None, hasCircularized = False, skipTRNA = False,
 		cfg_dir = os.path.dirname(__file__)
 		cfg_full_path = os.path.join(cfg_dir, 'Mitofinder.config')
 
-		with open(cfg_full_path,'r') as configFile:
-			#grabbing the tRNAscan-SE folder from the config file...
-			for line in configFile:
-				if '#' != line[0] and line != '\n':
-					configPart = line.lower().replace('\n','').replace(' ','').split('=')[0]
-					if configPart == 'mitfifolder':
-						MitFiFolder = line.replace('\n','').replace(' ','').split('=')[-1]
-						if MitFiFolder.lower() == 'default':
-							MitFiFolder = module_dir
-					elif configPart == 'arwenfolder':
-						ArwenFolder = line.replace('\n','').replace(' ','').split('=')[-1]
-						if ArwenFolder.lower() == 'default':
-							ArwenFolder = module_dir
-					elif configPart  == 'trnascanfolder':
-						tRNAscanFolder = line.replace('\n','').replace(' ','').split('=')[-1]
-						if tRNAscanFolder.lower() == 'default':
-							tRNAscanFolder = module_dir
+		if tRNAFolder != None:
+			MitFiFolder = ArwenFolder = tRNAscanFolder = tRNAFolder
+		else:
+			with open(cfg_full_path,'r') as configFile:
+				#grabbing the tRNAscan-SE folder from the config file...
+				for line in configFile:
+					if '#' != line[0] and line != '\n':
+						configPart = line.lower().replace('\n','').replace(' ','').split('=')[0]
+						if configPart == 'mitfifolder':
+							MitFiFolder = line.replace('\n','').replace(' ','').split('=')[-1]
+							if MitFiFolder.lower() == 'default':
+								MitFiFolder = module_dir
+						elif configPart == 'arwenfolder':
+							ArwenFolder = line.replace('\n','').replace(' ','').split('=')[-1]
+							if ArwenFolder.lower() == 'default':
+								ArwenFolder = module_dir
+						elif configPart  == 'trnascanfolder':
+							tRNAscanFolder = line.replace('\n','').replace(' ','').split('=')[-1]
+							if tRNAscanFolder.lower() == 'default':
+								tRNAscanFolder = module_dir
 		#adding the Arwen folder to these environments in the OS to avoid errors being thrown by Arwen
 		if tRNAscan == "mitfi":	
 			try:
-				os.environ["PATH"] += os.pathsep + MitFiFolder
-				os.environ["PERL5LIB"] += os.pathsep + MitFiFolder
+				addToEnvironment("PATH", MitFiFolder)
+				addToEnvironment("PERL5LIB", MitFiFolder)
 			except KeyError:
 				pass
 			except:
 				print('MitFi path is not correct. Change it in Mitofinder.config')
 		elif tRNAscan == "trnascan":	
 			try:
-				os.environ["PATH"] += os.pathsep + tRNAscanFolder
-				os.environ["PERL5LIB"] += os.pathsep + tRNAscanFolder
+				addToEnvironment("PATH", tRNAscanFolder)
+				addToEnvironment("PERL5LIB", tRNAscanFolder)
 			except KeyError:
 				pass
 			except:
 				print('tRNAscan path is not correct. Change it in Mitofinder.config')
 		elif tRNAscan == "arwen":	
 			try:
-				os.environ["PATH"] += os.pathsep + ArwenFolder
-				os.environ["PERL5LIB"] += os.pathsep + ArwenFolder
+				addToEnvironment("PATH", ArwenFolder)
+				addToEnvironment("PERL5LIB", ArwenFolder)
 			except KeyError:
 				pass
 			except:
@@ -266,12 +280,11 @@ def tRNAscanCheck(resultFile = None, hasCircularized = False, skipTRNA = False,
 					if MitFiFolder.lower() == 'installed':
 						command = "java -jar mitfi.jar -code "+ str(organismType) + " " + scanInput
 						args = shlex.split(command)
-						tRNAscanRun = Popen(args, stdout=open(outputName,"w"), stderr=tRNAscanLog)
+						tRNAscanRun = runReport.run(args, stdout=open(outputName,"w"), stderr=tRNAscanLog)
 					else:
 						command = "java -jar "+ MitFiFolder +"mitfi.jar -code "+ str(organismType) + " " + scanInput
 						args = shlex.split(command)
-						tRNAscanRun = Popen(args, cwd=MitFiFolder, stdout=open(outputName,"w"), stderr=tRNAscanLog)
-					tRNAscanRun.wait()
+						tRNAscanRun = runReport.run(args, cwd=MitFiFolder, stdout=open(outputName,"w"), stderr=tRNAscanLog)
 	
 				thisSequenceResult = Assembly(resultFile, outputName, hasCircularized, tRNAscan, organismType)
 				return thisSequenceResult
@@ -315,12 +328,11 @@ def tRNAscanCheck(resultFile = None, hasCircularized = False, skipTRNA = False,
 					if tRNAscanFolder.lower() == 'installed':
 						command = "tRNAscan-SE -X " + str(coveCutOff) + ' ' + geneticCode + organismFlag + "-o " + outputName + " " + scanInput
 						args = shlex.split(command)
-						tRNAscanRun = Popen(args, stdout=tRNAscanLog, stderr=tRNAscanLog)
+						tRNAscanRun = runReport.run(args, stdout=tRNAscanLog, stderr=tRNAscanLog)
 					else:
 						command = "tRNAscan-SE -X " + str(coveCutOff) + ' ' + geneticCode + organismFlag + "-o " + outputName + " " + scanInput
 						args = shlex.split(command)
-						tRNAscanRun = Popen(args, cwd=tRNAscanFolder, stdout=tRNAscanLog, stderr=tRNAscanLog)
-					tRNAscanRun.wait()
+						tRNAscanRun = runReport.run(args, cwd=tRNAscanFolder, stdout=tRNAscanLog, stderr=tRNAscanLog)
 	
 				thisSequenceResult = Assembly(resultFile, outputName, hasCircularized, tRNAscan, organismType)
 				return thisSequenceResult
@@ -359,14 +371,13 @@ def tRNAscanCheck(resultFile = None, hasCircularized = False, skipTRNA = False,
 						command = "arwen " + ' ' + geneticCode + "-o "\
 							+ outputName + " -w " + scanInput
 						args = shlex.split(command)
-						tRNAscanRun = Popen(args, stdout=tRNAscanLog, stderr=tRNAscanLog)
+						tRNAscanRun = runReport.run(args, stdout=tRNAscanLog, stderr=tRNAscanLog)
 					else:
 						command = "arwen " + ' ' + geneticCode + "-o "\
 							+ outputName + " -w " + scanInput
 						print(command)
 						args = shlex.split(command)
-						tRNAscanRun = Popen(args, cwd=ArwenFolder, stdout=tRNAscanLog, stderr=tRNAscanLog)
-					tRNAscanRun.wait()
+						tRNAscanRun = runReport.run(args, cwd=ArwenFolder, stdout=tRNAscanLog, stderr=tRNAscanLog)
 	
 				thisSequenceResult = Assembly(resultFile, outputName, hasCircularized, tRNAscan, organismType)
 				return thisSequenceResult